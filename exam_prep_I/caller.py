@@ -8,7 +8,9 @@ django.setup()
 
 # Import your models here
 from orm_skeleton.helpers import populate_model_with_data
+from orm_skeleton.leaderboards import read_leaderboard
 from main_app.models import Director, Actor, Movie
+from main_app.leaderboards import top_actors
 
 # Create queries within functions
 
@@ -90,34 +92,23 @@ def get_directors(search_name=None, search_nationality=None) -> str | None:
     return '\n'.join(f'Director: {d.full_name}, nationality: {d.nationality}, experience: {d.years_of_experience}' for d in directors)
 
 def get_top_director() -> str:
-    # top_director = Director.objects.get_directors_by_movies_count().first()
-    top_director = Director.objects.annotate(
-        movies_count=Count('director_movies')
-    ).order_by(
-        '-movies_count',
-        'full_name',
-    ).first()
+    top_director = Director.objects.get_directors_by_movies_count().first()
 
     if not top_director:
         return ''
 
     return f'Top director: {top_director.full_name}, movies: {top_director.movies_count}.'
 
-def get_top_actor() -> str:
-    top_actor = Actor.objects.prefetch_related(
-        'actor_movies'
-    ).annotate(
-        movies_count=Count('actor_movies'),
-        avg_rating=Avg('actor_movies__rating')
-    ).order_by(
-        '-movies_count',
-        'full_name',
-    ).first()
+def get_top_actor(from_leaderboard=False) -> str:
+    if from_leaderboard:
+        top_actor = next(iter(read_leaderboard('top_actors', 1)), None)
+    else:
+        top_actor = top_actors().first()
 
     if not top_actor or top_actor.movies_count:
         return ''
 
-    movies = ', '.join(m.title for m in top_actor.starring_movies.all() if m)
+    movies = ', '.join(m.title for m in Movie.objects.filter(starring_actor_id=top_actor.id) if m)
 
     return f"Top Actor: {top_actor.full_name}, starring in movies: {movies}, movies average rating: {top_actor.avg_rating:.1f}"
 
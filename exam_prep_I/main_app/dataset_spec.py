@@ -0,0 +1,20 @@
+from orm_skeleton.scale_factor import Zipf, LongTail
+from main_app.models import Director, Actor, Movie
+
+
+# Benchmark dataset for get_top_director, get_top_actor, get_actors_by_movies_count, get_top_rated_awarded_movie
+DATASET_SPEC = {
+    'seed': 20251123,
+    'models': [
+        (Director, {'share': 0.03}),
+        (Actor, {'share': 0.22}),
+        (Movie, {
+            'share': 0.75,
+            'profiles': {
+                'director': Zipf(1.1),
+                'starring_actor': Zipf(1.3),
+                'actors': LongTail(1.5),
+            },
+        }),
+    ],
+}
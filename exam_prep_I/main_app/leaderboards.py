@@ -0,0 +1,22 @@
+from django.db.models import Count, Avg
+
+from main_app.models import Actor, Movie
+from orm_skeleton.leaderboards import Leaderboard
+
+
+def top_actors():
+    return Actor.objects.annotate(
+        movies_count=Count('actor_movies'),
+        avg_rating=Avg('actor_movies__rating')
+    ).order_by(
+        '-movies_count',
+        'full_name',
+    )
+
+
+Leaderboard(
+    'top_actors',
+    top_actors,
+    fields=['id', 'full_name', 'movies_count', 'avg_rating'],
+    depends_on=[Actor, Movie],
+)
@@ -1,10 +1,9 @@
 from django.db import models
 
+from orm_skeleton.trigram_search import SearchableQuerySet
 
-class DirectorManager(models.Manager):
+
+class DirectorManager(models.Manager.from_queryset(SearchableQuerySet)):
     def get_directors_by_movies_count(self):
-        return self.annotate(
-            movies_count=models.Count(
-                'director_movies'
-            )
-        ).order_by('-movies_count', 'full_name')
\ No newline at end of file
+        # movies_count is a counter cache column, no join and aggregate needed
+        return self.order_by('-movies_count', 'full_name')
\ No newline at end of file
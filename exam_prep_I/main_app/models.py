@@ -2,6 +2,8 @@ from django.core.validators import MinLengthValidator, MinValueValidator, MaxVal
 from django.db import models
 from .mixins import IsAwardedMixin, LastUpdatedMixin
 from .managers import DirectorManager
+from orm_skeleton.counter_cache import CounterCacheField
+from orm_skeleton.trigram_search import trigram_indexes
 
 # Create your models here.
 
@@ -30,9 +32,16 @@ class Director(Base):
         ],
         default=0
     )
+    movies_count = CounterCacheField(
+        'Movie',
+        'director'
+    )
 
     objects = DirectorManager()
 
+    class Meta:
+        indexes = trigram_indexes('director', ['full_name', 'nationality'])
+
 class Actor(Base, IsAwardedMixin, LastUpdatedMixin):
     pass
 
@@ -0,0 +1,8 @@
+# Maximum number of queries per report function in caller.py, independent of the row count
+QUERY_BUDGETS = {
+    'get_directors': {'queries': 1, 'kwargs': {'search_name': 'Director 1'}},
+    'get_top_director': {'queries': 1},
+    'get_top_actor': {'queries': 2},
+    'get_actors_by_movies_count': {'queries': 1},
+    'get_top_rated_awarded_movie': {'queries': 3},
+}
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.db import connections, models, transaction
+
+from orm_skeleton.counter_cache import reconcile_loaded_models
+from orm_skeleton.fast_loader import load_rows
+from orm_skeleton.parallel_seeding import get_seeding_order
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 2
+NULL_LENGTH = 0xFFFFFFFF
+LENGTH_PREFIX = struct.Struct('<I')
+
+
+def get_snapshot_models(models):
+    """The models in FK dependency order, followed by their auto-created M2M tables."""
+    ordered = []
+
+    for level in get_seeding_order(models):
+        ordered.extend(level)
+
+    through_models = [
+        field.remote_field.through
+        for model in ordered
+        for field in model._meta.local_many_to_many
+        if field.remote_field.through._meta.auto_created
+    ]
+
+    return ordered + through_models
+
+
+def to_text(field, value):
+    # The serializers' text form, which Field.to_python() parses back
+    if isinstance(field, models.JSONField):
+        return json.dumps(value, cls=field.encoder)
+
+    return field.value_to_string(SimpleNamespace(**{field.attname: value}))
+
+
+def from_text(field, text):
+    if isinstance(field, models.JSONField):
+        return json.loads(text, cls=field.decoder)
+
+    return field.to_python(text)
+
+
+def encode_value(text):
+    if text is None:
+        return LENGTH_PREFIX.pack(NULL_LENGTH)
+
+    data = text.encode('utf-8')
+
+    return LENGTH_PREFIX.pack(len(data)) + data
+
+
+def read_values(path):
+    with open(path, 'rb') as column_file:
+        while prefix := column_file.read(LENGTH_PREFIX.size):
+            (length,) = LENGTH_PREFIX.unpack(prefix)
+
+            if length == NULL_LENGTH:
+                yield None
+            else:
+                yield column_file.read(length).decode('utf-8')
+
+
+def export_model(model, directory, using):
+    fields = model._meta.concrete_fields
+    table_directory = Path(directory) / model._meta.db_table
+    table_directory.mkdir(parents=True, exist_ok=True)
+
+    column_files = {field.attname: open(table_directory / f'{field.attname}.col', 'wb') for field in fields}
+    checksum = hashlib.sha256()
+    rows = 0
+
+    try:
+        queryset = model._base_manager.using(using).order_by('pk').values_list(*column_files)
+
+        for row in queryset.iterator(chunk_size=10_000):
+            for field, column_file, value in zip(fields, column_files.values(), row):
+                encoded = encode_value(None if value is None else to_text(field, value))
+                column_file.write(encoded)
+                checksum.update(encoded)
+            rows += 1
+    finally:
+        for column_file in column_files.values():
+            column_file.close()
+
+    return {
+        'model': model._meta.label,
+        'table': model._meta.db_table,
+        'rows': rows,
+        'columns': list(column_files),
+        'sha256': checksum.hexdigest(),
+    }
+
+
+def export_snapshot(models, directory, using='default'):
+    """
+    Dump the models (and their M2M tables) into one length-prefixed binary file per column
+    plus a manifest. Rows are written in primary key order, so the same data always gives
+    the same files and checksums. All tables are read from one snapshot of the database
+    (REPEATABLE READ on PostgreSQL), so it must not be called inside another transaction.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    with transaction.atomic(using=using):
+        if connections[using].vendor == 'postgresql':
+            with connections[using].cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+
+        tables = [export_model(model, directory, using) for model in get_snapshot_models(models)]
+
+    manifest = {'version': MANIFEST_VERSION, 'tables': tables}
+    with open(Path(directory) / MANIFEST_NAME, 'w') as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+
+    return manifest
+
+
+def read_manifest(directory):
+    with open(Path(directory) / MANIFEST_NAME) as manifest_file:
+        manifest = json.load(manifest_file)
+
+    if manifest.get('version') != MANIFEST_VERSION:
+        raise ValueError(f"Snapshot version {manifest.get('version')} is not supported, export it again.")
+
+    return manifest
+
+
+def get_table_model(table):
+    # M2M through models are not registered under an importable label, look them up by table
+    for model in apps.get_models(include_auto_created=True):
+        if model._meta.db_table == table['table']:
+            return model
+
+    raise LookupError(f"No model for snapshot table {table['table']}.")
+
+
+def get_outside_dependents(snapshot_models):
+    """Foreign keys of models outside the snapshot that point at snapshot models."""
+    snapshot_models = set(snapshot_models)
+
+    return [
+        f'{field.model._meta.label}.{field.name}'
+        for model in apps.get_models(include_auto_created=True)
+        if model not in snapshot_models
+        for field in model._meta.concrete_fields
+        if field.is_relation and field.related_model in snapshot_models
+    ]
+
+
+def clear_tables(snapshot_models, using):
+    # Only the snapshot tables are emptied, a cascade would also empty the tables that point at them
+    dependents = get_outside_dependents(snapshot_models)
+
+    if dependents:
+        raise ValueError(f"Cannot restore, models outside the snapshot point at it: {', '.join(dependents)}.")
+
+    connection = connections[using]
+    tables = [model._meta.db_table for model in snapshot_models]
+
+    for sql in connection.ops.sql_flush(no_style(), tables):
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+
+
+def restore_snapshot(directory, using='default', chunk_size=10_000):
+    """
+    Replace the snapshot tables' contents with the snapshot, keeping the original primary keys.
+    Goes through load_rows, so PostgreSQL restores with COPY and sequences are reset afterwards.
+    A table whose row count or sha256 differs from the manifest rolls the whole restore back.
+    """
+    manifest = read_manifest(directory)
+    tables = [(table, get_table_model(table)) for table in manifest['tables']]
+
+    with transaction.atomic(using=using):
+        clear_tables([model for table, model in reversed(tables)], using)
+
+        for table, model in tables:
+            fields = [model._meta.get_field(name) for name in table['columns']]
+            table_directory = Path(directory) / table['table']
+            columns = [read_values(table_directory / f'{name}.col') for name in table['columns']]
+            checksum = hashlib.sha256()
+
+            def parse(values):
+                # Re-encoding the text gives back the exported bytes, in the order they were hashed
+                for value in values:
+                    checksum.update(encode_value(value))
+
+                return [None if value is None else from_text(field, value) for field, value in zip(fields, values)]
+
+            loaded = load_rows(model, map(parse, zip(*columns)), table['columns'], chunk_size, using, reconcile=False)
+
+            if loaded != table['rows']:
+                raise ValueError(f"Snapshot table {table['table']} is truncated: {loaded} of {table['rows']} rows.")
+
+            if checksum.hexdigest() != table['sha256']:
+                raise ValueError(f"Snapshot table {table['table']} does not match its checksum.")
+
+        reconcile_loaded_models([model for table, model in tables], using)
+
+    return manifest
+
+
+if __name__ == '__main__':
+    # python -m orm_skeleton.snapshots export|restore <directory>
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
+    django.setup()
+
+    command, snapshot_directory = sys.argv[1], sys.argv[2]
+
+    if command == 'export':
+        export_snapshot(list(apps.get_app_config('main_app').get_models()), snapshot_directory)
+    else:
+        restore_snapshot(snapshot_directory)
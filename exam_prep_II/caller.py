@@ -10,6 +10,7 @@ django.setup()
 
 # Import your models here
 from orm_skeleton.helpers import populate_model_with_data
+from orm_skeleton.parallel_seeding import seed_models_in_parallel
 from main_app.models import Profile, Product, Order
 from django.db.models import Q, Count, F, When, Value, Case
 from typing import Optional
@@ -17,29 +18,27 @@ from main_app.querysets import ProfileQuerySet
 
 # Create queries within functions
 
-def populate_db() -> None:
-    populate_model_with_data(Profile)
-    populate_model_with_data(Product)
-    populate_model_with_data(Order)
+def populate_db(num_records=10, workers=None) -> None:
+    if workers:
+        seed_models_in_parallel({Profile: num_records, Product: num_records, Order: num_records}, workers=workers)
+        return
+
+    populate_model_with_data(Profile, num_records)
+    populate_model_with_data(Product, num_records)
+    populate_model_with_data(Order, num_records)
 
 
 def get_profiles(search_string: Optional[str]=None) -> str:
     if not search_string:
         return ''
 
-    profiles_match = Profile.objects.filter(
-        Q(full_name__icontains=search_string)
-            |
-        Q(email__icontains=search_string)
-            |
-        Q(phone_number__icontains=search_string)
-    ).order_by('full_name')
+    profiles_match = Profile.objects.search_with_orders_count(search_string)
 
     return '\n'.join(
         f'Profile: {pm.full_name}, '
         f'email: {pm.email}, '
         f'phone number: {pm.phone_number}, '
-        f'orders: {pm.order_set.count()}'
+        f'orders: {pm.orders_count}'
         for pm in profiles_match
     )
 
@@ -0,0 +1,19 @@
+from orm_skeleton.scale_factor import Zipf, LongTail
+from main_app.models import Profile, Product, Order
+
+
+# Benchmark dataset for get_profiles, get_loyal_profiles, get_top_products, apply_discounts
+DATASET_SPEC = {
+    'seed': 20251119,
+    'models': [
+        (Profile, {'share': 0.20}),
+        (Product, {'share': 0.05}),
+        (Order, {
+            'share': 0.75,
+            'profiles': {
+                'profile': LongTail(1.5),
+                'products': Zipf(1.1),
+            },
+        }),
+    ],
+}
@@ -2,6 +2,7 @@ from django.core.validators import MinLengthValidator, MaxLengthValidator, MinVa
 from django.db import models
 
 from main_app.querysets import ProfileQuerySet
+from orm_skeleton.trigram_search import trigram_indexes
 
 
 # Create your models here.
@@ -32,6 +33,9 @@ class Profile(TimeStampModel):
 
     objects = ProfileQuerySet.as_manager()
 
+    class Meta:
+        indexes = trigram_indexes('profile', ['full_name', 'email', 'phone_number'])
+
 class Product(TimeStampModel):
     MIN_PRICE = 0.01
 
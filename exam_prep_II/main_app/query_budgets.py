@@ -0,0 +1,7 @@
+# Maximum number of queries per report function in caller.py, independent of the row count
+QUERY_BUDGETS = {
+    'get_profiles': {'queries': 1, 'args': ('Profile 1',)},
+    'get_loyal_profiles': {'queries': 1},
+    'get_last_sold_products': {'queries': 2},
+    'get_top_products': {'queries': 1},
+}
@@ -1,9 +1,11 @@
 from django.db import models
-from django.db.models import QuerySet
+from django.db.models import QuerySet, Q
 from django.db.models.aggregates import Count
 
+from orm_skeleton.trigram_search import SearchableQuerySet
 
-class ProfileQuerySet(models.QuerySet):
+
+class ProfileQuerySet(SearchableQuerySet):
     def get_regular_customers(self) -> QuerySet:
         return self.annotate(
             count_orders=Count('order')
@@ -11,4 +13,17 @@ class ProfileQuerySet(models.QuerySet):
             count_orders__gt=2,
         ).order_by(
             '-count_orders'
+        )
+
+    def search_with_orders_count(self, search_string: str) -> QuerySet:
+        return self.filter(
+            Q(full_name__icontains=search_string)
+                |
+            Q(email__icontains=search_string)
+                |
+            Q(phone_number__icontains=search_string)
+        ).annotate(
+            orders_count=Count('order')
+        ).order_by(
+            'full_name'
         )
\ No newline at end of file
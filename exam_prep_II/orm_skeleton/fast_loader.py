@@ -0,0 +1,153 @@
+import io
+from datetime import date, time
+from decimal import Decimal
+from itertools import islice
+from uuid import UUID
+
+from django.core.management.color import no_style
+from django.db import connections, transaction
+from django.db.models import DateTimeField
+from django.db.models.fields import AutoFieldMixin
+from django.utils import timezone
+
+from orm_skeleton.counter_cache import reconcile_loaded_models
+
+# What get_db_prep_save() returns for the common fields; str() of them is valid PostgreSQL input
+CSV_TEXT_TYPES = (str, int, float, Decimal, date, time, UUID)
+
+
+def get_load_fields(model, field_names=None):
+    concrete_fields = [field for field in model._meta.concrete_fields]
+
+    # Auto-increment keys are left to the database unless they are asked for explicitly
+    if field_names is None:
+        return [field for field in concrete_fields if not isinstance(field, AutoFieldMixin)]
+
+    fields_by_name = {}
+    for field in concrete_fields:
+        fields_by_name[field.name] = field
+        fields_by_name[field.attname] = field
+
+    return [fields_by_name[name] for name in field_names]
+
+
+def get_missing_value(field):
+    if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+        return timezone.now() if isinstance(field, DateTimeField) else date.today()
+
+    return field.get_default()
+
+
+def row_to_values(row, fields):
+    # Rows can be model instances, dicts keyed by name/attname or tuples in field order
+    if isinstance(row, dict):
+        return [
+            row[field.attname] if field.attname in row else row.get(field.name, get_missing_value(field))
+            for field in fields
+        ]
+
+    if hasattr(row, '_meta'):
+        return [field.pre_save(row, add=True) for field in fields]
+
+    return list(row)
+
+
+def prepare_values(values, fields, connection):
+    return [field.get_db_prep_save(value, connection) for field, value in zip(fields, values)]
+
+
+def chunked(iterable, chunk_size):
+    iterator = iter(iterable)
+
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def to_csv_value(value):
+    # Unquoted empty field is NULL for COPY ... CSV, a quoted one is an empty string
+    if value is None:
+        return ''
+
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+
+    if isinstance(value, (bytes, memoryview)):
+        text = '\\x' + bytes(value).hex()
+    elif isinstance(value, CSV_TEXT_TYPES):
+        text = str(value)
+    elif hasattr(value, 'adapted') and hasattr(value, 'dumps'):
+        # psycopg2's Json wrapper, which JSONField prepares its values as
+        text = value.dumps(value.adapted)
+    else:
+        raise TypeError(f"load_rows cannot send {type(value).__name__} values with COPY ... CSV.")
+
+    return '"' + text.replace('"', '""') + '"'
+
+
+def write_csv_chunk(rows):
+    buffer = io.StringIO()
+
+    for values in rows:
+        buffer.write(','.join(to_csv_value(value) for value in values))
+        buffer.write('\n')
+
+    buffer.seek(0)
+    return buffer
+
+
+def copy_chunk(cursor, table, columns, rows):
+    raw_cursor = cursor.cursor
+
+    # psycopg2
+    if hasattr(raw_cursor, 'copy_expert'):
+        raw_cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", write_csv_chunk(rows))
+        return
+
+    # psycopg 3 adapts every value with the connection's dumpers, as it does for query parameters
+    with raw_cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+        for values in rows:
+            copy.write_row(values)
+
+
+def reset_sequences(model, connection):
+    for sql in connection.ops.sequence_reset_sql(no_style(), [model]):
+        with connection.cursor() as cursor:
+            cursor.execute(sql)
+
+
+def load_rows(model, rows, field_names=None, chunk_size=10_000, using='default', reconcile=True):
+    """
+    Stream rows into the model's table without building model instances or going through save().
+    On PostgreSQL every chunk is sent with COPY ... FROM STDIN, elsewhere with a chunked
+    executemany INSERT. Sequences are reset afterwards so explicit primary keys are safe, and the
+    counter caches the rows affect are recounted, reconcile=False leaves that to the caller.
+    Returns the number of loaded rows.
+    """
+    connection = connections[using]
+    fields = get_load_fields(model, field_names)
+    table = connection.ops.quote_name(model._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+    is_postgresql = connection.vendor == 'postgresql'
+
+    placeholders = ', '.join(['%s'] * len(fields))
+    sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"
+
+    loaded = 0
+    for chunk in chunked(rows, chunk_size):
+        prepared = [prepare_values(row_to_values(row, fields), fields, connection) for row in chunk]
+
+        with transaction.atomic(using=using), connection.cursor() as cursor:
+            if is_postgresql:
+                copy_chunk(cursor, table, columns, prepared)
+            else:
+                cursor.executemany(sql, prepared)
+
+        loaded += len(prepared)
+
+    if loaded and any(field.primary_key for field in fields):
+        reset_sequences(model, connection)
+
+    if loaded and reconcile:
+        reconcile_loaded_models([model], using)
+
+    return loaded
@@ -0,0 +1,110 @@
+import re
+from functools import lru_cache, reduce
+from operator import or_
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import migrations, models
+from django.db.backends.signals import connection_created
+from django.db.models import Q
+from django.db.models.functions import Greatest, Upper
+
+TRIGRAM_OPCLASS = 'gin_trgm_ops'
+
+
+def trigram_indexes(prefix, fields):
+    """
+    One trigram GIN index per field for Meta.indexes, e.g. trigram_indexes('publisher', ['name', 'country']).
+    The indexed expression is UPPER(field), the one Django's icontains compiles to on PostgreSQL
+    (UPPER("field"::text) LIKE UPPER('%x%')), so they serve icontains lookups, admin search_fields
+    and fuzzy_search().
+    """
+    return [
+        GinIndex(OpClass(Upper(field), name=TRIGRAM_OPCLASS), name=f'{prefix}_{field}_trgm'[:30])
+        for field in fields
+    ]
+
+
+def get_trigram_fields(model):
+    fields = []
+
+    for index in model._meta.indexes:
+        if isinstance(index, GinIndex) and index.expressions:
+            expression = index.expressions[0]
+
+            if isinstance(expression, OpClass) and expression.extra['name'] == TRIGRAM_OPCLASS:
+                upper = expression.get_source_expressions()[0]
+                fields.append(upper.get_source_expressions()[0].name)
+
+    return fields
+
+
+def create_trigram_extension(apps, schema_editor):
+    # Used with migrations.RunPython: TrigramExtension from django.contrib.postgres needs psycopg even on SQLite
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+
+class AddTrigramIndex(migrations.AddIndex):
+    """AddIndex that only touches PostgreSQL, SQLite has no trigram indexes."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+@lru_cache(maxsize=10_000)
+def trigrams(text):
+    # Same extraction as pg_trgm: lower case words padded with two spaces in front and one behind
+    grams = set()
+
+    for word in re.findall(r'\w+', text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+
+    return frozenset(grams)
+
+
+def word_similarity(term, text):
+    """Share of the term's trigrams found in text, an approximation of pg_trgm's word_similarity()."""
+    term_grams = trigrams(str(term or ''))
+
+    if not term_grams:
+        return 0.0
+
+    return len(term_grams & trigrams(str(text or ''))) / len(term_grams)
+
+
+def register_word_similarity(sender, connection, **kwargs):
+    # SQLite gets word_similarity() as a user function, so fuzzy_search() compiles to the same SQL
+    if connection.vendor == 'sqlite':
+        connection.connection.create_function('word_similarity', 2, word_similarity, deterministic=True)
+
+
+connection_created.connect(register_word_similarity, dispatch_uid='trigram_search_word_similarity')
+
+
+class SearchableQuerySet(models.QuerySet):
+    def fuzzy_search(self, term, fields=None, threshold=None):
+        """
+        Rows where any of the fields contains term (case-insensitive), with a `similarity` (0..1)
+        and ordered by it. With a threshold, rows whose word similarity reaches it match as well,
+        so typos are found. fields default to the model's trigram indexes.
+
+        The threshold is compared in the WHERE clause, so nothing is left on the connection.
+        On PostgreSQL the icontains conditions are served by the trigram indexes, on SQLite
+        word_similarity() is a Python function registered on every connection.
+        """
+        fields = list(fields or get_trigram_fields(self.model))
+        contains = reduce(or_, (Q(**{f'{field}__icontains': term}) for field in fields))
+        similarities = [TrigramWordSimilarity(term, field) for field in fields]
+        similarity = similarities[0] if len(similarities) == 1 else Greatest(*similarities)
+
+        if threshold is not None:
+            contains |= Q(similarity__gte=threshold)
+
+        return self.annotate(similarity=similarity).filter(contains).order_by('-similarity', 'pk')
@@ -1,39 +1,31 @@
 # Generated by Django 5.2.7 on 2025-10-25 11:39
 
 from django.db import migrations
+from django.db.models import Case, Value, When
 
-def set_rarity(apps, schema_editor):
-    ItemModel = apps.get_model('main_app', 'Item')
-
-    for i in ItemModel.objects.all():
-        if i.price <= 10:
-            i.rarity = 'Rare'
-        elif i.quantity <= 20:
-            i.rarity = 'Very Rare'
-        elif i.quantity <= 30:
-            i.rarity = 'Extremely Rare'
-        else:
-            i.rarity = 'Mega Rare'
-        i.save()
-
-def reverse_rarity(apps, schema_editor):
-    ItemModel = apps.get_model('main_app', 'Item')
-    default_rarity = ItemModel._meta.get_field('rarity').default
-
-    for i in ItemModel.objects.all():
-        i.rarity = default_rarity
-        i.save()
+from orm_skeleton.batched_migrations import BatchedRunPython
 
 
 class Migration(migrations.Migration):
+    # Every chunk of items commits on its own
+    atomic = False
 
     dependencies = [
         ('main_app', '0011_item'),
     ]
 
     operations = [
-        migrations.RunPython(
-            code=set_rarity,
-            reverse_code=reverse_rarity
+        BatchedRunPython(
+            'Item',
+            update={
+                'rarity': Case(
+                    When(price__lte=10, then=Value('Rare')),
+                    When(quantity__lte=20, then=Value('Very Rare')),
+                    When(quantity__lte=30, then=Value('Extremely Rare')),
+                    default=Value('Mega Rare'),
+                ),
+            },
+            reverse_update={'rarity': 'No rarity'},
+            name='set_rarity',
         )
     ]
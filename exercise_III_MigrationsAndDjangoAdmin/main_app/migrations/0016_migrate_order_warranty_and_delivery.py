@@ -2,36 +2,35 @@
 from datetime import timedelta
 
 from django.db import migrations
+from django.db.models import F
 
 from main_app.choices import OrderStatusChoices
+from orm_skeleton.batched_migrations import BatchedRunPython
 
 
-def set_fields(apps, schema_editor):
-    OrderModel = apps.get_model('main_app', 'Order')
+def set_fields(orders):
+    updated = orders.filter(status=OrderStatusChoices.PENDING).update(delivery=F('order_date') + timedelta(days=3))
+    updated += orders.filter(status=OrderStatusChoices.COMPLETED).update(warranty="24 months")
+    orders.filter(status=OrderStatusChoices.CANCELLED).delete()
 
-    for o in OrderModel.objects.all():
-        if o.status == OrderStatusChoices.PENDING:
-            o.delivery = o.order_date + timedelta(days=3)
-            o.save()
-        elif o.status == OrderStatusChoices.COMPLETED:
-            o.warranty = "24 months"
-            o.save()
-        elif o.status == OrderStatusChoices.CANCELLED:
-            o.delete()
+    return updated
 
-def reverse_set_fields(apps, schema_editor):
+def reverse_set_fields(orders):
     pass
 
 
 class Migration(migrations.Migration):
+    # Every chunk of orders commits on its own
+    atomic = False
 
     dependencies = [
         ('main_app', '0015_order'),
     ]
 
     operations = [
-        migrations.RunPython(
-            code=set_fields,
-            reverse_code=reverse_set_fields
+        BatchedRunPython(
+            'Order',
+            update=set_fields,
+            reverse_update=reverse_set_fields,
         )
     ]
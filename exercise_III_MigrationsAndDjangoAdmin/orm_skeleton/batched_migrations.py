@@ -0,0 +1,183 @@
+import logging
+import time
+
+from django.db import connections, router, transaction
+from django.db.migrations.operations.base import Operation
+
+PROGRESS_TABLE = 'batched_migration_progress'
+
+logger = logging.getLogger('orm_skeleton.batched_migrations')
+
+
+class BatchedRunPython(Operation):
+    """
+    Data migration that walks a model's table in primary key order, chunk_size rows at a time.
+
+    Each chunk is either written set-based with `update`, a dict for QuerySet.update() or a
+    function taking the chunk's queryset, or loaded and passed to `callback`, a function taking
+    the list of instances, after which the changed `fields` are saved with bulk_update():
+
+        BatchedRunPython(
+            'Person',
+            update={'age_group': Case(When(age__lte=12, then=Value('Child')), default=Value('Adult'))},
+            reverse_update={'age_group': 'No age group'},
+        )
+
+    An `update` function may return the number of rows it changed, which is counted instead of
+    the chunk's size. Every chunk commits on its own and records the last primary key it reached,
+    so a migration that was interrupted resumes from there. This needs `atomic = False` on the
+    Migration, inside an atomic migration the chunks are savepoints and nothing is committed before
+    the end. Progress is logged at INFO level to the orm_skeleton.batched_migrations logger.
+    """
+
+    reduces_to_sql = False
+
+    def __init__(self, model_name, update=None, callback=None, fields=None, reverse_update=None,
+                 reverse_callback=None, chunk_size=1000, name=None, hints=None, elidable=False):
+        if (update is None) == (callback is None):
+            raise ValueError("BatchedRunPython needs either update or callback.")
+
+        if callback is not None and not fields:
+            raise ValueError("BatchedRunPython needs the fields the callback changes.")
+
+        self.model_name = model_name
+        self.update = update
+        self.callback = callback
+        self.fields = fields
+        self.reverse_update = reverse_update
+        self.reverse_callback = reverse_callback
+        self.chunk_size = chunk_size
+        self.name = name or getattr(callback or update, '__name__', 'update')
+        self.hints = hints or {}
+        self.elidable = elidable
+
+    def deconstruct(self):
+        kwargs = {'model_name': self.model_name}
+
+        for attr in ('update', 'callback', 'fields', 'reverse_update', 'reverse_callback', 'hints'):
+            if getattr(self, attr):
+                kwargs[attr] = getattr(self, attr)
+
+        if self.chunk_size != 1000:
+            kwargs['chunk_size'] = self.chunk_size
+
+        if self.elidable:
+            kwargs['elidable'] = True
+
+        return self.__class__.__name__, [], kwargs
+
+    @property
+    def reversible(self):
+        return self.reverse_update is not None or self.reverse_callback is not None
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if router.allow_migrate(schema_editor.connection.alias, app_label, **self.hints):
+            model = from_state.apps.get_model(app_label, self.model_name)
+            self.run(model, schema_editor.connection.alias, self.update, self.callback, 'forwards')
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if not self.reversible:
+            raise NotImplementedError(f"You cannot reverse {self.describe()}.")
+
+        if router.allow_migrate(schema_editor.connection.alias, app_label, **self.hints):
+            model = from_state.apps.get_model(app_label, self.model_name)
+            self.run(model, schema_editor.connection.alias, self.reverse_update, self.reverse_callback, 'backwards')
+
+    def describe(self):
+        return f"Batched data migration {self.name} of {self.model_name}"
+
+    def run(self, model, using, update, callback, direction):
+        key = f'{model._meta.label}.{self.name}.{direction}'
+        manager = model._base_manager.db_manager(using)
+        last_pk, rows = get_progress(using, key, model)
+        started, started_rows = time.monotonic(), rows
+
+        if last_pk is not None:
+            logger.info("%s: resuming after pk %s (%d rows done)", self.name, last_pk, rows)
+
+        while True:
+            remaining = manager.order_by('pk')
+            if last_pk is not None:
+                remaining = remaining.filter(pk__gt=last_pk)
+
+            with transaction.atomic(using=using):
+                if callback is not None:
+                    objs = list(remaining[:self.chunk_size])
+                    if not objs:
+                        break
+
+                    callback(objs)
+                    manager.bulk_update(objs, self.fields)
+                    pks = [objs[0].pk, objs[-1].pk]
+                    changed = len(objs)
+                else:
+                    pks = list(remaining.values_list('pk', flat=True)[:self.chunk_size])
+                    if not pks:
+                        break
+
+                    chunk = manager.filter(pk__gte=pks[0], pk__lte=pks[-1])
+                    if callable(update):
+                        changed = update(chunk)
+                        if changed is None:
+                            changed = len(pks)
+                    else:
+                        changed = chunk.update(**update)
+
+                last_pk = pks[-1]
+                rows += changed
+                save_progress(using, key, last_pk, rows)
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            "%s: %d rows, %.0f rows/sec", self.name, rows, (rows - started_rows) / elapsed if elapsed else 0,
+        )
+        clear_progress(using, key)
+
+
+def ensure_progress_table(connection):
+    with connection.cursor() as cursor:
+        if PROGRESS_TABLE not in connection.introspection.table_names(cursor):
+            cursor.execute(
+                f"CREATE TABLE {connection.ops.quote_name(PROGRESS_TABLE)} "
+                f"(name varchar(255) PRIMARY KEY, last_pk varchar(255) NOT NULL, rows_done bigint NOT NULL)"
+            )
+
+
+def get_progress(using, key, model):
+    connection = connections[using]
+    ensure_progress_table(connection)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT last_pk, rows_done FROM {connection.ops.quote_name(PROGRESS_TABLE)} WHERE name = %s",
+            [key],
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        return None, 0
+
+    return model._meta.pk.to_python(row[0]), row[1]
+
+
+def save_progress(using, key, last_pk, rows):
+    # Runs inside the chunk's transaction, so the progress commits together with the rows
+    connection = connections[using]
+    table = connection.ops.quote_name(PROGRESS_TABLE)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE name = %s", [key])
+        cursor.execute(
+            f"INSERT INTO {table} (name, last_pk, rows_done) VALUES (%s, %s, %s)",
+            [key, str(last_pk), rows],
+        )
+
+
+def clear_progress(using, key):
+    connection = connections[using]
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {connection.ops.quote_name(PROGRESS_TABLE)} WHERE name = %s", [key])
@@ -9,10 +9,10 @@ django.setup()
 
 # Import your models here
 from main_app.models import Pet, Artifact, Location, Car, Task, HotelRoom
-from django.db.models import QuerySet
+from django.db.models import F, Q, QuerySet
 from decimal import Decimal
-from typing import Optional
 from main_app.choices import RoomTypeChoice
+from orm_skeleton.backfill import backfill_column
 # Create queries within functions
 
 def create_pet(name: str, species: str) -> str:
@@ -76,13 +76,21 @@ def delete_first_location() -> None:
 # print(get_capitals())
 
 
-def apply_discount() -> None:
-    cars = Car.objects.all()
+def discounted_price(year: int, price: Decimal) -> Decimal:
+    discount = Decimal(str(sum(int(d) for d in str(year)) / 100))
+    return price * (1 - discount)
 
-    for c in cars:
-        discount = Decimal(str(sum(int(d) for d in str(c.year)) / 100))
-        c.price_with_discount = c.price * (1 - discount)
-        c.save()
+def apply_discount() -> None:
+    # The discount is the digit sum of the year in percent. The database sums the four digits of
+    # ordinary years, any other year is left to Python.
+    four_digit_years = Q(year__range=(1000, 9999))
+
+    Car.objects.filter(four_digit_years).update_with(
+        price_with_discount=lambda c: c.price - c.price * (
+            c.year // 1000 + c.year // 100 % 10 + c.year // 10 % 10 + c.year % 10
+        ) / 100
+    )
+    backfill_column(Car.objects.exclude(four_digit_years), 'price_with_discount', ['year', 'price'], discounted_price)
 
 def get_recent_cars() -> QuerySet:
     recent_cars = Car.objects.filter(year__gt=2020).values('model', 'price_with_discount')
@@ -118,11 +126,6 @@ def complete_odd_tasks() -> None:
 def encode_and_replace(text: str, task_title: str) -> None:
     encoded_text = ''.join(chr(ord(l) - 3) for l in text)
 
-    # Option 1: python loop -> worst
-    for task in Task.objects.filter(title=task_title):
-        task.description = encoded_text
-        task.save()
-
     # Option 3: direct update -> best ->
     Task.objects.filter(title=task_title).update(description=encoded_text)
 
@@ -137,17 +140,8 @@ def get_deluxe_rooms() -> str|None:
     return None
 
 def increase_room_capacity() -> None:
-    reserved_rooms = HotelRoom.objects.filter(is_reserved=True).order_by('id')
-    previous_room : Optional[HotelRoom] = None
-
-    for r in reserved_rooms:
-        if previous_room:
-            r.capacity += previous_room.capacity
-        else:
-            r.capacity += r.id
-
-        previous_room = r
-        r.save()
+    # Every reserved room adds the new capacity of the previous one, the first adds its own id
+    HotelRoom.objects.filter(is_reserved=True).cumulative_update('capacity', order_by=['id'], seed=F('id'))
 
 def reserve_first_room() -> None:
     first_room = HotelRoom.objects.first()
@@ -1,6 +1,8 @@
 from django.db import models
 
 from main_app.choices import RoomTypeChoice
+from orm_skeleton.expression_compiler import UpdateWithQuerySet
+from orm_skeleton.window_updates import CumulativeQuerySet
 
 # Create your models here.
 class Pet(models.Model):
@@ -58,6 +60,8 @@ class Car(models.Model):
         default=0
     )
 
+    objects = UpdateWithQuerySet.as_manager()
+
 
 class Task(models.Model):
     title = models.CharField(
@@ -84,4 +88,6 @@ class HotelRoom(models.Model):
     )
     is_reserved = models.BooleanField(
         default=False
-    )
\ No newline at end of file
+    )
+
+    objects = CumulativeQuerySet.as_manager()
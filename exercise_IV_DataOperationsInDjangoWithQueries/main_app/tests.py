@@ -1,3 +1,157 @@
+from datetime import date
+from decimal import Decimal
+from unittest import skipUnless
+
+from django.db import connection
 from django.test import TestCase
 
-# Create your tests here.
+from caller import apply_discount, discounted_price, increase_room_capacity
+from main_app.models import Car, HotelRoom, Task
+from orm_skeleton.backfill import backfill_column
+from orm_skeleton.expression_compiler import CompileError, compile_expression
+
+
+def digit_sum_discount(year, price):
+    # Module level, so a process pool can pickle it
+    return price * (1 - Decimal(sum(int(digit) for digit in str(year))) / 100)
+
+
+class ExpressionCompilerTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Car.objects.create(model='Golf', year=1993, color='Çé', price='100.00', price_with_discount='0.00')
+        Task.objects.create(title='Sample Task', description='Hello World', due_date=date(2025, 1, 1))
+
+    def evaluate(self, model, fn):
+        return model.objects.annotate(value=compile_expression(model, fn)).values_list('value', flat=True).get()
+
+    def assert_like_python(self, fn, **row):
+        car = Car.objects.create(model='Test', color='Red', price_with_discount='0.00', **row)
+        value = Car.objects.filter(pk=car.pk).annotate(value=compile_expression(Car, fn)).values_list('value', flat=True).get()
+
+        self.assertEqual(value, fn(Car.objects.get(pk=car.pk)))
+
+    def test_floor_division_floors_like_python(self):
+        self.assert_like_python(lambda car: (car.year - 2000) // 2, year=1993, price='1.00')
+        self.assert_like_python(lambda car: (2000 - car.year) // 2, year=1993, price='1.00')
+        self.assert_like_python(lambda car: (car.year - 2000) // -2, year=1993, price='1.00')
+        self.assert_like_python(lambda car: (car.year - 2000) // 7, year=1993, price='1.00')
+
+    def test_modulo_takes_the_sign_of_the_divisor_like_python(self):
+        self.assert_like_python(lambda car: (car.year - 2000) % 2, year=1993, price='1.00')
+        self.assert_like_python(lambda car: (2000 - car.year) % -2, year=1993, price='1.00')
+        self.assert_like_python(lambda car: (car.year - 2000) % -3, year=1993, price='1.00')
+        self.assert_like_python(lambda car: (car.year - 2000) % 7, year=1993, price='1.00')
+
+    def test_int_truncates_like_python(self):
+        self.assert_like_python(lambda car: int(car.price), year=2000, price='-2.70')
+        self.assert_like_python(lambda car: int(car.price), year=2000, price='2.70')
+
+    def test_round_halves_to_even_like_python(self):
+        for price in ('2.50', '3.50', '-2.50', '-3.50', '2.49', '-2.51'):
+            with self.subTest(price=price):
+                self.assert_like_python(lambda car: round(car.price), year=2000, price=price)
+
+        self.assert_like_python(lambda car: round(car.price, 1), year=2000, price='2.25')
+        self.assert_like_python(lambda car: round(car.price, 1), year=2000, price='2.35')
+
+    def test_slices(self):
+        self.assertEqual(self.evaluate(Task, lambda task: task.description[1:3]), 'el')
+        self.assertEqual(self.evaluate(Task, lambda task: task.description[6:]), 'World')
+        self.assertEqual(self.evaluate(Task, lambda task: task.description[:5]), 'Hello')
+        self.assertEqual(self.evaluate(Task, lambda task: task.description[0]), 'H')
+        self.assertEqual(self.evaluate(Task, lambda task: task.description[3:1]), '')
+
+    def test_negative_slice_indexes_are_rejected(self):
+        with self.assertRaises(CompileError):
+            compile_expression(Task, lambda task: task.description[-1:])
+
+    @skipUnless(connection.vendor == 'sqlite', "SQLite's LOWER() only folds ASCII letters")
+    def test_lower_leaves_non_ascii_unchanged_on_sqlite(self):
+        self.assertEqual(self.evaluate(Car, lambda car: car.color.lower()), 'Çé')
+        self.assertEqual(self.evaluate(Task, lambda task: task.title.lower()), 'sample task')
+
+    def test_unsupported_code_is_rejected(self):
+        with self.assertRaises(CompileError):
+            compile_expression(Car, lambda car: car.model.title())
+
+
+class BackfillColumnTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Car.objects.bulk_create([
+            Car(model=f'Car {year}', year=year, color='Red', price='100.00', price_with_discount='0.00')
+            for year in range(1990, 2015)
+        ])
+
+    def assert_discounted(self, cars):
+        for year, price, price_with_discount in cars.values_list('year', 'price', 'price_with_discount'):
+            self.assertEqual(price_with_discount, round(digit_sum_discount(year, price), 2))
+
+    def test_every_row_is_written_across_chunks(self):
+        rows = backfill_column(Car.objects.all(), 'price_with_discount', ['year', 'price'], digit_sum_discount, chunk_size=4)
+
+        self.assertEqual(rows, 25)
+        self.assert_discounted(Car.objects.all())
+
+    def test_only_the_queryset_rows_are_written(self):
+        backfill_column(Car.objects.filter(year__gte=2010), 'price_with_discount', ['year', 'price'], digit_sum_discount)
+
+        self.assert_discounted(Car.objects.filter(year__gte=2010))
+        self.assertFalse(Car.objects.filter(year__lt=2010).exclude(price_with_discount=0).exists())
+
+    def test_chunks_computed_in_a_process_pool(self):
+        rows = backfill_column(
+            Car.objects.all(), 'price_with_discount', ['year', 'price'], digit_sum_discount, chunk_size=5, processes=2,
+        )
+
+        self.assertEqual(rows, 25)
+        self.assert_discounted(Car.objects.all())
+
+
+class ApplyDiscountTests(TestCase):
+    def test_discount_is_the_digit_sum_of_any_year(self):
+        for year in (999, 1993, 2024, 9999, 10000, 123456):
+            Car.objects.create(model=f'Car {year}', year=year, color='Red', price='100.00', price_with_discount='0.00')
+
+        apply_discount()
+
+        for year, price, price_with_discount in Car.objects.values_list('year', 'price', 'price_with_discount'):
+            with self.subTest(year=year):
+                self.assertEqual(price_with_discount, round(discounted_price(year, price), 2))
+
+
+class CumulativeUpdateTests(TestCase):
+    def setUp(self):
+        for number, (room_type, capacity, is_reserved) in enumerate([
+            ('Standard', 2, True), ('Deluxe', 3, False), ('Suite', 4, True), ('Standard', 1, True), ('Deluxe', 5, True),
+        ], start=101):
+            HotelRoom.objects.create(
+                room_number=number, room_type=room_type, capacity=capacity, amenities='TV',
+                price_per_night='100.00', is_reserved=is_reserved,
+            )
+
+    def capacities(self):
+        return dict(HotelRoom.objects.values_list('id', 'capacity'))
+
+    def test_running_totals_match_the_row_by_row_loop(self):
+        # The loop increase_room_capacity() replaced
+        expected = self.capacities()
+        previous_room = None
+
+        for room in HotelRoom.objects.filter(is_reserved=True).order_by('id'):
+            expected[room.id] += expected[previous_room.id] if previous_room else room.id
+            previous_room = room
+
+        increase_room_capacity()
+
+        self.assertEqual(self.capacities(), expected)
+
+    def test_totals_restart_for_every_partition(self):
+        rows = HotelRoom.objects.cumulative_update('capacity', order_by=['room_number'], partition_by=['room_type'])
+
+        self.assertEqual(rows, 5)
+        self.assertEqual(
+            dict(HotelRoom.objects.values_list('room_number', 'capacity')),
+            {101: 2, 102: 3, 103: 4, 104: 3, 105: 8},
+        )
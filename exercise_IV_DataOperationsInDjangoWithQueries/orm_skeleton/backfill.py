@@ -0,0 +1,93 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections, transaction
+
+
+def read_chunks(queryset, sources, chunk_size):
+    # Keyset pagination on the primary key: each chunk is a short query, so rows can be written
+    # back between reads without holding a cursor open over the table being updated
+    last_pk = None
+
+    while True:
+        rows = queryset.order_by('pk')
+        if last_pk is not None:
+            rows = rows.filter(pk__gt=last_pk)
+
+        chunk = list(rows.values_list('pk', *sources)[:chunk_size])
+        if not chunk:
+            return
+
+        yield chunk
+        last_pk = chunk[-1][0]
+
+
+def compute_chunk(fn, chunk):
+    return [(pk, fn(*values)) for pk, *values in chunk]
+
+
+def write_chunk(queryset, field, results):
+    model = queryset.model
+    connection = connections[queryset.db]
+
+    with transaction.atomic(using=queryset.db):
+        if connection.vendor == 'postgresql':
+            # One UPDATE joined to the computed values instead of a CASE with a branch per row
+            quote = connection.ops.quote_name
+            table = quote(model._meta.db_table)
+            row_sql = f'(%s::{model._meta.pk.cast_db_type(connection)}, %s::{field.cast_db_type(connection)})'
+            params = []
+
+            for pk, value in results:
+                params += [model._meta.pk.get_db_prep_value(pk, connection), field.get_db_prep_save(value, connection)]
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"UPDATE {table} SET {quote(field.column)} = v.value "
+                    f"FROM (VALUES {', '.join([row_sql] * len(results))}) AS v(pk, value) "
+                    f"WHERE {table}.{quote(model._meta.pk.column)} = v.pk",
+                    params,
+                )
+        else:
+            model._base_manager.using(queryset.db).bulk_update(
+                [model(pk=pk, **{field.attname: value}) for pk, value in results],
+                [field.name],
+            )
+
+    return len(results)
+
+
+def backfill_column(queryset, target, sources, fn, chunk_size=2000, processes=None):
+    """
+    Set target to fn(*sources) for every row of queryset, for values that need Python to compute:
+
+        backfill_column(Car.objects.all(), 'price_with_discount', ['year', 'price'], discounted_price)
+
+    Only the pk and the sources are read, chunk_size rows at a time, and only target is written,
+    each chunk in its own transaction. With processes, chunks are computed in a process pool while
+    the next ones are read; fn must then be a module level function. Returns the number of rows written.
+    """
+    field = queryset.model._meta.get_field(target)
+    chunks = read_chunks(queryset, sources, chunk_size)
+    rows = 0
+
+    if not processes:
+        for chunk in chunks:
+            rows += write_chunk(queryset, field, compute_chunk(fn, chunk))
+
+        return rows
+
+    with ProcessPoolExecutor(processes) as pool:
+        pending = deque()
+
+        for chunk in chunks:
+            pending.append(pool.submit(compute_chunk, fn, chunk))
+
+            # Bounded look-ahead, so a large table is never read into memory ahead of the writes
+            if len(pending) > processes:
+                rows += write_chunk(queryset, field, pending.popleft().result())
+
+        while pending:
+            rows += write_chunk(queryset, field, pending.popleft().result())
+
+    return rows
@@ -0,0 +1,490 @@
+import ast
+import inspect
+import linecache
+from decimal import Decimal
+from functools import lru_cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from django.db.models import Case, ExpressionWrapper, F, Q, Value, When
+from django.db.models.functions import (
+    Abs, Cast, Ceil, Concat, Floor, Greatest, Least, Length, Lower, LTrim, Mod, Power, Replace, RTrim, Substr, Trim,
+    Upper,
+)
+from django.db.models.lookups import Exact, GreaterThan, GreaterThanOrEqual, In, LessThan, LessThanOrEqual
+
+STRING_FIELDS = {'CharField', 'TextField', 'EmailField', 'SlugField', 'URLField'}
+INTEGER_FIELDS = {
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField', 'SmallIntegerField',
+    'PositiveIntegerField', 'PositiveBigIntegerField', 'PositiveSmallIntegerField',
+}
+FIELD_KINDS = {
+    **{name: 'str' for name in STRING_FIELDS},
+    **{name: 'int' for name in INTEGER_FIELDS},
+    'DecimalField': 'decimal',
+    'FloatField': 'float',
+    'BooleanField': 'bool',
+}
+CONSTANT_KINDS = {str: 'str', bool: 'bool', int: 'int', float: 'float', Decimal: 'decimal'}
+NUMERIC_KINDS = ('int', 'decimal', 'float')
+
+COMPARISONS = {
+    ast.Eq: Exact,
+    ast.Gt: GreaterThan,
+    ast.GtE: GreaterThanOrEqual,
+    ast.Lt: LessThan,
+    ast.LtE: LessThanOrEqual,
+}
+STRING_METHODS = {'lower': Lower, 'upper': Upper, 'strip': Trim, 'lstrip': LTrim, 'rstrip': RTrim}
+
+
+class CompileError(ValueError):
+    pass
+
+
+def output_field(kind):
+    return {
+        'str': models.TextField(),
+        'int': models.IntegerField(),
+        'float': models.FloatField(),
+        'decimal': models.DecimalField(max_digits=65, decimal_places=30),
+        'bool': models.BooleanField(),
+    }.get(kind)
+
+
+def wrap(expression, kind):
+    return ExpressionWrapper(expression, output_field=output_field(kind))
+
+
+def python_mod(left, right, kind):
+    """left % right with Python's sign: SQL's remainder takes the dividend's sign, Python's the divisor's."""
+    remainder = Mod(left, right, output_field=output_field(kind))
+    zero = Value(0)
+    opposite_signs = (
+        (Q(LessThan(remainder, zero)) & Q(GreaterThan(right, zero)))
+        | (Q(GreaterThan(remainder, zero)) & Q(LessThan(right, zero)))
+    )
+
+    return Case(
+        When(opposite_signs, then=wrap(remainder + right, kind)),
+        default=remainder,
+        output_field=output_field(kind),
+    )
+
+
+def floor_divide(left, right):
+    # left - left % right is a multiple of right, so SQL's truncating division is exact on it
+    exact = wrap(left - python_mod(left, right, 'int'), 'int')
+    return Cast(wrap(exact / right, 'int'), models.IntegerField())
+
+
+def truncate(value):
+    """int() of a number rounds towards zero, a plain CAST rounds to the nearest integer on PostgreSQL."""
+    return Cast(
+        Case(
+            When(Q(GreaterThanOrEqual(value, Value(0))), then=Floor(value)),
+            default=Ceil(value),
+        ),
+        models.IntegerField(),
+    )
+
+
+def round_half_even(value, kind, precision):
+    """Python's round(): halfway values go to the even neighbour, SQL's ROUND() moves them away from zero."""
+    scale = 10 ** precision
+    scaled = wrap(value * Value(scale), kind) if precision else value
+    floor = Floor(scaled, output_field=output_field(kind))
+    fraction = wrap(scaled - floor, kind)
+    half = Value(Decimal('0.5') if kind == 'decimal' else 0.5)
+
+    rounded = Case(
+        When(Q(GreaterThan(fraction, half)), then=wrap(floor + Value(1), kind)),
+        When(Q(LessThan(fraction, half)), then=floor),
+        default=wrap(floor + python_mod(floor, Value(2), kind), kind),
+        output_field=output_field(kind),
+    )
+
+    if not precision:
+        return Cast(rounded, models.IntegerField()), 'int'
+
+    return wrap(rounded / Value(scale), kind), kind
+
+
+@lru_cache(maxsize=64)
+def parse_source(source):
+    return ast.parse(source)
+
+
+def get_function_node(fn):
+    """The ast of fn, found in its whole source file so lambdas inside multi-line calls parse."""
+    code = fn.__code__
+    source = ''.join(linecache.getlines(code.co_filename))
+
+    if not source:
+        raise CompileError(f"The source of {fn.__qualname__} is not available.")
+
+    arg_names = list(code.co_varnames[:code.co_argcount])
+    candidates = [
+        node for node in ast.walk(parse_source(source))
+        if isinstance(node, (ast.Lambda, ast.FunctionDef))
+        and (node.decorator_list[0].lineno if getattr(node, 'decorator_list', None) else node.lineno) == code.co_firstlineno
+        and [arg.arg for arg in node.args.args] == arg_names
+        and (isinstance(node, ast.Lambda) or node.name == code.co_name)
+    ]
+
+    if len(candidates) > 1 and hasattr(code, 'co_positions'):
+        # Lambdas sharing a line are told apart by the columns their bytecode comes from
+        positions = [
+            (line, column) for line, _, column, end_column in code.co_positions()
+            if line and column is not None and column != end_column
+        ]
+        candidates = [
+            node for node in candidates
+            if all((node.lineno, node.col_offset) <= position <= (node.end_lineno, node.end_col_offset) for position in positions)
+        ]
+        candidates = [node for node in candidates if not any(other is not node and other in ast.walk(node) for other in candidates)]
+
+    if len(candidates) != 1:
+        raise CompileError(f"Cannot tell {fn.__qualname__} apart from the other lambdas on its line.")
+
+    return candidates[0]
+
+
+class ExpressionCompiler:
+    """
+    Translates a function of one row into an ORM expression. It supports:
+
+    - field access (row.price) and constants, including the function's globals and closure variables;
+    - arithmetic with Python's results: // floors, % takes the divisor's sign, int() truncates
+      and round() rounds halfway values to even, whatever the database does;
+    - str concatenation, f-strings and constant slices;
+    - lower(), upper(), strip(), replace(), len(), str(), int(), float(), abs(), round(), min() and max();
+    - comparisons, `and`/`or`/`not` and conditional expressions.
+
+    A def may also assign local names before its return. Anything else raises CompileError.
+    """
+
+    def __init__(self, model, fn):
+        self.model = model
+        self.fn = fn
+        self.node = get_function_node(fn)
+
+        if len(self.node.args.args) != 1:
+            raise CompileError(f"{fn.__qualname__} must take exactly one argument, the row.")
+
+        self.row = self.node.args.args[0].arg
+        closure = inspect.getclosurevars(fn)
+        self.constants = {**closure.globals, **closure.nonlocals}
+        self.locals = {}
+
+    def error(self, node, reason):
+        return CompileError(f"Cannot compile {ast.unparse(node)!r} of {self.fn.__qualname__}: {reason}.")
+
+    def compile(self):
+        """(expression, kind) of the function's result."""
+        if isinstance(self.node, ast.Lambda):
+            return self.value(self.node.body)
+
+        for statement in self.node.body:
+            if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Constant):
+                continue  # docstring
+            if isinstance(statement, ast.Assign) and len(statement.targets) == 1 and isinstance(statement.targets[0], ast.Name):
+                self.locals[statement.targets[0].id] = self.value(statement.value)
+            elif isinstance(statement, ast.Return) and statement.value is not None:
+                return self.value(statement.value)
+            else:
+                raise self.error(statement, "only assignments to names and a return are supported")
+
+        raise self.error(self.node, "it has no return")
+
+    def compile_update(self):
+        """{field: expression} of a function returning a dict literal with constant keys."""
+        body = self.node.body if isinstance(self.node, ast.Lambda) else None
+
+        if not isinstance(body, ast.Dict) or not all(isinstance(key, ast.Constant) for key in body.keys):
+            raise self.error(self.node, "update_with(fn) needs a lambda returning a dict literal")
+
+        return {key.value: self.value(value)[0] for key, value in zip(body.keys, body.values)}
+
+    def constant(self, node, value):
+        kind = CONSTANT_KINDS.get(type(value))
+
+        if value is None:
+            return Value(None), 'none'
+        if kind is None:
+            raise self.error(node, f"{type(value).__name__} values are not supported")
+
+        return Value(value, output_field=output_field(kind)), kind
+
+    def field(self, node):
+        try:
+            field = self.model._meta.get_field(node.attr)
+        except FieldDoesNotExist:
+            field = next((f for f in self.model._meta.concrete_fields if f.attname == node.attr), None)
+
+            if field is None:
+                raise self.error(node, f"{self.model.__name__} has no field {node.attr}") from None
+
+        return F(node.attr), FIELD_KINDS.get(field.get_internal_type(), 'other')
+
+    def value(self, node):
+        method = getattr(self, f'value_{type(node).__name__}', None)
+
+        if method is None:
+            raise self.error(node, f"{type(node).__name__} is not supported")
+
+        return method(node)
+
+    def value_Constant(self, node):
+        return self.constant(node, node.value)
+
+    def value_Name(self, node):
+        if node.id == self.row:
+            raise self.error(node, "use the row's fields, not the row itself")
+        if node.id in self.locals:
+            return self.locals[node.id]
+        if node.id in self.constants:
+            return self.constant(node, self.constants[node.id])
+
+        raise self.error(node, f"{node.id} is not defined")
+
+    def value_Attribute(self, node):
+        if isinstance(node.value, ast.Name) and node.value.id == self.row:
+            return self.field(node)
+
+        raise self.error(node, "only fields of the row can be read")
+
+    def value_BinOp(self, node):
+        left, left_kind = self.value(node.left)
+        right, right_kind = self.value(node.right)
+        kinds = {left_kind, right_kind}
+
+        if isinstance(node.op, ast.Add) and kinds == {'str'}:
+            return Concat(left, right, output_field=models.TextField()), 'str'
+
+        if not kinds <= set(NUMERIC_KINDS):
+            raise self.error(node, "arithmetic needs numbers on both sides")
+
+        kind = 'float' if 'float' in kinds else 'decimal' if 'decimal' in kinds else 'int'
+
+        if isinstance(node.op, ast.Div):
+            if kind == 'int':
+                # Python's / is true division, SQL's truncates integers
+                left, kind = Cast(left, models.FloatField()), 'float'
+            return ExpressionWrapper(left / right, output_field=output_field(kind)), kind
+        if isinstance(node.op, ast.FloorDiv):
+            if kind != 'int':
+                raise self.error(node, "// is only supported on integers")
+            return floor_divide(left, right), kind
+        if isinstance(node.op, ast.Mod):
+            return python_mod(left, right, kind), kind
+        if isinstance(node.op, ast.Pow):
+            return Power(left, right, output_field=output_field('float')), 'float'
+
+        operators = {ast.Add: '__add__', ast.Sub: '__sub__', ast.Mult: '__mul__'}
+        if type(node.op) not in operators:
+            raise self.error(node, f"{type(node.op).__name__} is not supported")
+
+        return ExpressionWrapper(getattr(left, operators[type(node.op)])(right), output_field=output_field(kind)), kind
+
+    def value_UnaryOp(self, node):
+        if isinstance(node.op, ast.Not):
+            return self.boolean(node)
+
+        operand, kind = self.value(node.operand)
+
+        if kind not in NUMERIC_KINDS:
+            raise self.error(node, "only numbers can be negated")
+        if isinstance(node.op, ast.USub):
+            return ExpressionWrapper(operand * -1, output_field=output_field(kind)), kind
+
+        return operand, kind
+
+    def value_IfExp(self, node):
+        then, then_kind = self.value(node.body)
+        default, default_kind = self.value(node.orelse)
+        kind = then_kind if then_kind != 'none' else default_kind
+
+        return Case(
+            When(self.condition(node.test), then=then),
+            default=default,
+            output_field=output_field(kind),
+        ), kind
+
+    def value_Compare(self, node):
+        return self.boolean(node)
+
+    def value_BoolOp(self, node):
+        return self.boolean(node)
+
+    def boolean(self, node):
+        return Case(
+            When(self.condition(node), then=Value(True)),
+            default=Value(False),
+            output_field=models.BooleanField(),
+        ), 'bool'
+
+    def value_Subscript(self, node):
+        string, kind = self.value(node.value)
+
+        if kind != 'str':
+            raise self.error(node, "only strings can be sliced")
+
+        if isinstance(node.slice, ast.Slice):
+            if node.slice.step is not None:
+                raise self.error(node, "slices with a step are not supported")
+
+            start = self.index(node.slice.lower) if node.slice.lower else 0
+            stop = self.index(node.slice.upper) if node.slice.upper else None
+
+            if stop is None:
+                return Substr(string, start + 1), 'str'
+
+            return Substr(string, start + 1, max(stop - start, 0)), 'str'
+
+        return Substr(string, self.index(node.slice) + 1, 1), 'str'
+
+    def index(self, node):
+        expression, kind = self.value(node)
+
+        if not isinstance(expression, Value) or kind != 'int' or expression.value < 0:
+            raise self.error(node, "string indexes must be non-negative integer constants")
+
+        return expression.value
+
+    def value_JoinedStr(self, node):
+        parts = []
+
+        for value in node.values:
+            if isinstance(value, ast.FormattedValue):
+                if value.conversion != -1 or value.format_spec is not None:
+                    raise self.error(value, "conversions and format specs are not supported")
+
+                expression, kind = self.value(value.value)
+                parts.append(expression if kind == 'str' else Cast(expression, models.TextField()))
+            else:
+                parts.append(Value(value.value))
+
+        if len(parts) == 1:
+            return parts[0], 'str'
+
+        return Concat(*parts, output_field=models.TextField()), 'str'
+
+    def value_Call(self, node):
+        if node.keywords:
+            raise self.error(node, "keyword arguments are not supported")
+
+        if isinstance(node.func, ast.Attribute):
+            string, kind = self.value(node.func.value)
+            args = [self.value(arg)[0] for arg in node.args]
+
+            if kind != 'str':
+                raise self.error(node, f"{node.func.attr}() is only supported on strings")
+            if node.func.attr in STRING_METHODS and not args:
+                return STRING_METHODS[node.func.attr](string), 'str'
+            if node.func.attr == 'replace' and len(args) == 2:
+                return Replace(string, *args), 'str'
+
+            raise self.error(node, f"str.{node.func.attr}() is not supported")
+
+        if not isinstance(node.func, ast.Name):
+            raise self.error(node, "only builtins and str methods can be called")
+
+        args = [self.value(arg) for arg in node.args]
+        name = node.func.id
+        kinds = {kind for _, kind in args}
+
+        if name == 'len' and len(args) == 1:
+            return Length(args[0][0]), 'int'
+        if name == 'int' and len(args) == 1 and args[0][1] in ('float', 'decimal'):
+            return truncate(args[0][0]), 'int'
+        if name in ('str', 'int', 'float') and len(args) == 1:
+            kind = {'str': 'str', 'int': 'int', 'float': 'float'}[name]
+            return Cast(args[0][0], output_field(kind)), kind
+        if name == 'abs' and len(args) == 1:
+            return Abs(args[0][0]), args[0][1]
+        if name == 'round' and len(args) in (1, 2) and args[0][1] in NUMERIC_KINDS:
+            precision = self.index(node.args[1]) if len(args) == 2 else 0
+            if args[0][1] == 'int':
+                return args[0]
+            return round_half_even(args[0][0], args[0][1], precision)
+        if name in ('min', 'max') and len(args) >= 2 and kinds <= set(NUMERIC_KINDS):
+            kind = 'float' if 'float' in kinds else 'decimal' if 'decimal' in kinds else 'int'
+            function = Least if name == 'min' else Greatest
+            return function(*[arg for arg, _ in args], output_field=output_field(kind)), kind
+
+        raise self.error(node, f"{name}() is not supported")
+
+    def condition(self, node):
+        """A Q of a test, for When() and Q combinations."""
+        if isinstance(node, ast.BoolOp):
+            conditions = [self.condition(value) for value in node.values]
+            combined = conditions[0]
+
+            for condition in conditions[1:]:
+                combined = combined & condition if isinstance(node.op, ast.And) else combined | condition
+
+            return combined
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            return ~self.condition(node.operand)
+
+        if isinstance(node, ast.Compare):
+            conditions = []
+            left = self.value(node.left)[0]
+
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    if not isinstance(comparator, (ast.Tuple, ast.List, ast.Set)):
+                        raise self.error(comparator, "`in` needs a literal tuple, list or set")
+
+                    condition = Q(In(left, [self.value(element)[0] for element in comparator.elts]))
+                    conditions.append(~condition if isinstance(op, ast.NotIn) else condition)
+                    continue
+
+                right = self.value(comparator)[0]
+
+                if isinstance(op, ast.NotEq):
+                    conditions.append(~Q(Exact(left, right)))
+                elif type(op) in COMPARISONS:
+                    conditions.append(Q(COMPARISONS[type(op)](left, right)))
+                else:
+                    raise self.error(node, f"{type(op).__name__} comparisons are not supported")
+
+                left = right
+
+            combined = conditions[0]
+            for condition in conditions[1:]:
+                combined &= condition
+
+            return combined
+
+        expression, kind = self.value(node)
+
+        if kind != 'bool':
+            raise self.error(node, "conditions must be comparisons or boolean fields")
+
+        return Q(Exact(expression, True))
+
+
+def compile_expression(model, fn):
+    """The ORM expression computing fn(row) for rows of model, raises CompileError if it cannot be translated."""
+    return ExpressionCompiler(model, fn).compile()[0]
+
+
+class UpdateWithQuerySet(models.QuerySet):
+    def update_with(self, fn=None, **fns):
+        """
+        QuerySet.update() with the new values given as functions of the row, compiled to SQL:
+
+            Student.objects.update_with(email=lambda s: f'{s.first_name.lower()}.{s.last_name.lower()}@uni.com')
+            Car.objects.update_with(lambda car: {'price_with_discount': car.price * 0.9})
+
+        Runs as one UPDATE, raises CompileError before touching the database if a function cannot be translated.
+        """
+        values = ExpressionCompiler(self.model, fn).compile_update() if fn is not None else {}
+
+        for field, field_fn in fns.items():
+            values[field] = compile_expression(self.model, field_fn)
+
+        return self.update(**values)
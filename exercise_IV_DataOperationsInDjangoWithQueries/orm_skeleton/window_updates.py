@@ -0,0 +1,56 @@
+from django.db import connections, models, transaction
+from django.db.models import F, Sum, Value, Window
+from django.db.models.expressions import Expression, RowRange
+from django.db.models.functions import FirstValue
+
+
+def to_order_by(names):
+    return [F(name[1:]).desc() if name.startswith('-') else F(name).asc() for name in names]
+
+
+class CumulativeQuerySet(models.QuerySet):
+    def cumulative_update(self, field, order_by=('pk',), seed=0, partition_by=None):
+        """
+        Set field to the running total of field over the rows in order_by order plus seed,
+        i.e. row n gets seed + field(1) + ... + field(n), in one UPDATE:
+
+            HotelRoom.objects.filter(is_reserved=True).cumulative_update('capacity', order_by=['id'], seed=F('id'))
+
+        An expression seed is taken from the first row. With partition_by the total restarts
+        for every group. Needs window functions and UPDATE ... FROM (PostgreSQL, SQLite 3.33+).
+        Returns the number of rows updated.
+        """
+        order_by = to_order_by([*order_by, 'pk'])
+        partition_by = [F(name) for name in partition_by] if partition_by else None
+        model_field = self.model._meta.get_field(field)
+
+        running = Window(
+            Sum(field),
+            partition_by=partition_by,
+            order_by=order_by,
+            frame=RowRange(start=None, end=0),
+        )
+
+        if isinstance(seed, (Expression, F)):
+            seed = Window(FirstValue(seed), partition_by=partition_by, order_by=order_by)
+        else:
+            seed = Value(seed)
+
+        totals = self.annotate(
+            cumulative_pk=F('pk'),
+            cumulative_value=models.ExpressionWrapper(running + seed, output_field=model_field),
+        ).values('cumulative_pk', 'cumulative_value')
+
+        connection = connections[self.db]
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        sql, params = totals.query.get_compiler(self.db).as_sql()
+
+        with transaction.atomic(using=self.db), connection.cursor() as cursor:
+            # A derived table rather than a WITH clause, sqlite3 reports no rowcount for statements starting with WITH
+            cursor.execute(
+                f"UPDATE {table} SET {quote(model_field.column)} = cumulative.cumulative_value "
+                f"FROM ({sql}) AS cumulative WHERE {table}.{quote(self.model._meta.pk.column)} = cumulative.cumulative_pk",
+                params,
+            )
+            return cursor.rowcount
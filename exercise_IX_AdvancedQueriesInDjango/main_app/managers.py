@@ -3,6 +3,7 @@ from django.db.models import Count, Avg
 
 
 from main_app.queryset import RealEstateListingQuerySet, VideoGameQuerySet
+from orm_skeleton.aggregate_cache import CachedAggregatesMixin, cached_aggregate
 
 
 class RealEstateListingManager(models.Manager.from_queryset(RealEstateListingQuerySet)):
@@ -12,13 +13,16 @@ class RealEstateListingManager(models.Manager.from_queryset(RealEstateListingQue
         ).order_by('-location_count', 'location')[:2]
 
 
-class VideoGameManager(models.Manager.from_queryset(VideoGameQuerySet)):
+class VideoGameManager(CachedAggregatesMixin, models.Manager.from_queryset(VideoGameQuerySet)):
+    @cached_aggregate()
     def highest_rated_game(self) -> 'VideoGame':
         return self.order_by('-rating').first()
 
+    @cached_aggregate()
     def lowest_rated_game(self) -> 'VideoGame':
         return self.order_by('rating').first()
 
+    @cached_aggregate()
     def average_rating(self) -> str:
         average_rating = self.aggregate(
             average_rating=Avg('rating')
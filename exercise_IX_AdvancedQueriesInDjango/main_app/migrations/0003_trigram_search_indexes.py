@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:58
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+from orm_skeleton.trigram_search import AddTrigramIndex, create_trigram_extension
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_alter_videogame_rating'),
+    ]
+
+    operations = [
+        # Both operations only touch PostgreSQL
+        migrations.RunPython(create_trigram_extension, migrations.RunPython.noop),
+        AddTrigramIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('title'), name='gin_trgm_ops'), name='task_title_trgm'),
+        ),
+        AddTrigramIndex(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('description'), name='gin_trgm_ops'), name='task_description_trgm'),
+        ),
+    ]
@@ -6,6 +6,7 @@ from django.db.models import QuerySet, Q, F
 
 from main_app.managers import RealEstateListingManager, VideoGameManager
 from main_app.validators import RangeValidator
+from orm_skeleton.trigram_search import SearchableQuerySet, trigram_indexes
 
 
 # Create your models here.
@@ -115,6 +116,11 @@ class Task(models.Model):
     creation_date = models.DateField()
     completion_date = models.DateField()
 
+    objects = SearchableQuerySet.as_manager()
+
+    class Meta:
+        indexes = trigram_indexes('task', ['title', 'description'])
+
     @classmethod
     def ongoing_high_priority_tasks(cls) -> QuerySet['Task']:
         return cls.objects.filter(
@@ -136,6 +142,11 @@ class Task(models.Model):
             Q(title__icontains=query) | Q(description__icontains=query)
         )
 
+    @classmethod
+    def fuzzy_search_tasks(cls, query: str, threshold: float = 0.3) -> QuerySet['Task']:
+        # Best matches first, close misspellings match too
+        return cls.objects.fuzzy_search(query, ['title', 'description'], threshold=threshold)
+
     @classmethod
     def recent_completed_tasks(cls, days: int) -> QuerySet['Task']:
         return cls.objects.filter(
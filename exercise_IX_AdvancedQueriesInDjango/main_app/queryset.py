@@ -3,6 +3,8 @@ from decimal import Decimal
 from django.db.models import QuerySet
 from django.db import models
 
+from orm_skeleton.aggregate_cache import VersionedQuerySet
+
 class RealEstateListingQuerySet(models.QuerySet):
     def by_property_type(self, property_type: str) -> QuerySet:
         return self.filter(property_type=property_type)
@@ -14,7 +16,7 @@ class RealEstateListingQuerySet(models.QuerySet):
         return self.filter(bedrooms=bedrooms_count)
 
 
-class VideoGameQuerySet(models.QuerySet):
+class VideoGameQuerySet(VersionedQuerySet):
     def games_by_genre(self, genre: str) -> QuerySet:
         return self.filter(genre=genre)
 
@@ -0,0 +1,105 @@
+from functools import wraps
+
+from django.core.cache import caches
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+
+CACHE_ALIAS = 'default'
+MISSING = object()
+
+
+def get_version_key(model):
+    return f'aggregate_cache:{model._meta.label}:version'
+
+
+def get_model_version(model):
+    cache = caches[CACHE_ALIAS]
+    version = cache.get(get_version_key(model))
+
+    if version is None:
+        cache.add(get_version_key(model), 1, timeout=None)
+        version = cache.get(get_version_key(model), 1)
+
+    return version
+
+
+def bump_model_version(model, using='default'):
+    """Invalidate every cached aggregate of the model, again on commit if inside a transaction."""
+    def bump():
+        cache = caches[CACHE_ALIAS]
+        try:
+            cache.incr(get_version_key(model))
+        except ValueError:
+            cache.add(get_version_key(model), 1, timeout=None)
+
+    bump()
+
+    # Another process could cache the old values again before the transaction commits
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(bump, using=using)
+
+
+def cached_aggregate(timeout=None):
+    """
+    Memoize a manager method in the cache, keyed by the method, its arguments and the model version.
+
+        class VideoGameManager(CachedAggregatesMixin, models.Manager):
+            @cached_aggregate()
+            def average_rating(self): ...
+
+    The manager must use CachedAggregatesMixin, so that writes bump the model version.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = caches[CACHE_ALIAS]
+            key = (
+                f'aggregate_cache:{self.model._meta.label}:{method.__name__}:'
+                f'{get_model_version(self.model)}:{args!r}:{sorted(kwargs.items())!r}'
+            )
+
+            result = cache.get(key, MISSING)
+            if result is MISSING:
+                result = method(self, *args, **kwargs)
+                cache.set(key, result, timeout)
+
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+class VersionedQuerySet(models.QuerySet):
+    """Bumps the model version on writes that do not send post_save or post_delete."""
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        bump_model_version(self.model, self.db)
+        return rows
+
+    def bulk_create(self, *args, **kwargs):
+        objs = super().bulk_create(*args, **kwargs)
+        bump_model_version(self.model, self.db)
+        return objs
+
+    def bulk_update(self, *args, **kwargs):
+        rows = super().bulk_update(*args, **kwargs)
+        bump_model_version(self.model, self.db)
+        return rows
+
+
+class CachedAggregatesMixin:
+    """Manager mixin connecting post_save and post_delete of the model to a version bump."""
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+
+        if not cls._meta.abstract:
+            uid = f'aggregate_cache_{cls._meta.label}'
+            post_save.connect(invalidate_aggregates, sender=cls, weak=False, dispatch_uid=uid)
+            post_delete.connect(invalidate_aggregates, sender=cls, weak=False, dispatch_uid=uid)
+
+
+def invalidate_aggregates(sender, using='default', **kwargs):
+    bump_model_version(sender, using)
@@ -106,7 +106,6 @@ from decimal import Decimal
 # print(f"{flash.name} - Energy: {flash.energy}")
 
 
-# from django.contrib.postgres.search import SearchVector
 # # Create the first 'Document' object with a title and content.
 # document1 = Document.objects.create(
 #     title="Django Framework 1",
@@ -119,12 +118,11 @@ from decimal import Decimal
 #     content="Django framework provides tools for creating web pages, handling URL routing, and more.",
 # )
 #
-# # Update the 'search_vector' field in the 'Document' model with search vectors.
-# Document.objects.update(search_vector=SearchVector('title', 'content'))
+# # 'search_vector' is kept up to date by a database trigger, no manual update needed.
 #
 # # Perform a full-text search for documents containing the words 'django' and 'web framework'.
-# results = Document.objects.filter(search_vector='django web framework')
+# results = Document.objects.search('django web framework')
 #
 # # Print the search results.
 # for result in results:
-#     print(f"Title: {result.title}")
+#     print(f"Title: {result.title}, rank: {result.rank:.3f}, {result.headline}")
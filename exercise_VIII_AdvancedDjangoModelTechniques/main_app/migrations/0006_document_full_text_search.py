@@ -0,0 +1,124 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:56
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+SEARCH_INDEX = django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='document_search_vector_gin')
+
+POSTGRESQL_WEIGHTED_VECTOR = """
+    setweight(to_tsvector('english', coalesce({row}title, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}content, '')), 'B')
+"""
+
+POSTGRESQL_FORWARD = [
+    f"""
+    CREATE FUNCTION main_app_document_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {POSTGRESQL_WEIGHTED_VECTOR.format(row='NEW.')};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER main_app_document_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, content ON main_app_document
+    FOR EACH ROW EXECUTE FUNCTION main_app_document_search_vector_update()
+    """,
+    f"UPDATE main_app_document SET search_vector = {POSTGRESQL_WEIGHTED_VECTOR.format(row='')}",
+]
+
+POSTGRESQL_BACKWARD = [
+    "DROP TRIGGER IF EXISTS main_app_document_search_vector_trigger ON main_app_document",
+    "DROP FUNCTION IF EXISTS main_app_document_search_vector_update()",
+]
+
+# External content FTS5 table: the text stays in main_app_document, only the index is stored
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE main_app_document_fts USING fts5(
+        title, content, content='main_app_document', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER main_app_document_fts_insert AFTER INSERT ON main_app_document BEGIN
+        INSERT INTO main_app_document_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER main_app_document_fts_delete AFTER DELETE ON main_app_document BEGIN
+        INSERT INTO main_app_document_fts(main_app_document_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER main_app_document_fts_update AFTER UPDATE OF title, content ON main_app_document BEGIN
+        INSERT INTO main_app_document_fts(main_app_document_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO main_app_document_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "INSERT INTO main_app_document_fts(main_app_document_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS main_app_document_fts_insert",
+    "DROP TRIGGER IF EXISTS main_app_document_fts_delete",
+    "DROP TRIGGER IF EXISTS main_app_document_fts_update",
+    "DROP TABLE IF EXISTS main_app_document_fts",
+]
+
+
+def create_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        schema_editor.add_index(apps.get_model('main_app', 'Document'), SEARCH_INDEX)
+        statements = POSTGRESQL_FORWARD
+    elif vendor == 'sqlite':
+        statements = SQLITE_FORWARD
+    else:
+        return
+
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+
+    if vendor == 'postgresql':
+        for sql in POSTGRESQL_BACKWARD:
+            schema_editor.execute(sql)
+        schema_editor.remove_index(apps.get_model('main_app', 'Document'), SEARCH_INDEX)
+    elif vendor == 'sqlite':
+        for sql in SQLITE_BACKWARD:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0005_document'),
+    ]
+
+    operations = [
+        # Drops the B-tree index, which cannot serve tsvector matches
+        migrations.AlterField(
+            model_name='document',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # GIN only exists on PostgreSQL, SQLite gets an FTS5 table instead
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(
+                    model_name='document',
+                    index=SEARCH_INDEX,
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_search_backend, drop_search_backend),
+            ],
+        ),
+    ]
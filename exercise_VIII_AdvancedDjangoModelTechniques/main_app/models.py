@@ -1,10 +1,12 @@
 from decimal import Decimal
 
+from django.contrib.postgres.indexes import GinIndex
 from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import RegexValidator, URLValidator, MinLengthValidator, MinValueValidator, MaxValueValidator
 from django.db import models
 
 from main_app.mixins import RechargeEnergyMixin
+from main_app.querysets import DocumentQuerySet
 from main_app.validators import NameValidator, PhoneNumberValidator
 
 
@@ -218,7 +220,15 @@ class Document(models.Model):
 
     content = models.TextField()
 
+    # Filled by a database trigger: title weighted 'A', content 'B' (see migration 0006)
     search_vector = SearchVectorField(
         null=True,
-        db_index=True,
-    )
\ No newline at end of file
+        editable=False,
+    )
+
+    objects = DocumentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='document_search_vector_gin'),
+        ]
\ No newline at end of file
@@ -0,0 +1,73 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connections, models
+from django.db.models import F
+from django.db.models.expressions import RawSQL
+
+SEARCH_CONFIG = 'english'
+HEADLINE_START, HEADLINE_STOP = '<b>', '</b>'
+
+# SQLite keeps the index in an FTS5 table with the same weights as the tsvector (title 'A', content 'B')
+FTS_TABLE = 'main_app_document_fts'
+FTS_WEIGHTS = '2.0, 1.0'
+
+
+def to_fts5_query(search_string):
+    # Every word as a quoted phrase, so FTS5 operators in user input are matched literally
+    return ' '.join('"' + word.replace('"', '""') + '"' for word in search_string.split())
+
+
+class DocumentQuerySet(models.QuerySet):
+    def search(self, search_string):
+        """
+        Documents matching every word of search_string, best first, annotated with
+        rank and a headline snippet of the content with the matches in <b></b>.
+        """
+        if not search_string.split():
+            return self.none()
+
+        if connections[self.db].vendor == 'postgresql':
+            return self._search_postgresql(search_string)
+
+        return self._search_fts5(search_string)
+
+    def _search_postgresql(self, search_string):
+        query = SearchQuery(search_string, search_type='websearch', config=SEARCH_CONFIG)
+
+        return self.filter(
+            search_vector=query
+        ).annotate(
+            rank=SearchRank(F('search_vector'), query),
+            headline=SearchHeadline(
+                'content',
+                query,
+                config=SEARCH_CONFIG,
+                start_sel=HEADLINE_START,
+                stop_sel=HEADLINE_STOP,
+                max_words=30,
+                min_words=10,
+            ),
+        ).order_by('-rank', 'pk')
+
+    def _search_fts5(self, search_string):
+        query = to_fts5_query(search_string)
+        table = self.model._meta.db_table
+
+        # bm25() is lower for better matches, negated so both backends order by '-rank'
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, {FTS_WEIGHTS}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+            [query],
+        )
+        headline = RawSQL(
+            f"SELECT snippet({FTS_TABLE}, 1, '{HEADLINE_START}', '{HEADLINE_STOP}', '...', 30) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = {table}.id",
+            [query],
+        )
+        matches = RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query])
+
+        return self.filter(
+            pk__in=matches
+        ).annotate(
+            rank=rank,
+            headline=headline,
+        ).order_by('-rank', 'pk')
@@ -1,3 +1,43 @@
 from django.test import TestCase
 
-# Create your tests here.
+from main_app.models import Document
+
+
+class DocumentSearchTests(TestCase):
+    def setUp(self):
+        self.django = Document.objects.create(title='Django', content='A high-level Python web framework.')
+        self.flask = Document.objects.create(title='Flask', content='A lightweight web framework.')
+
+    def found(self, search_string):
+        return list(Document.objects.search(search_string).values_list('title', flat=True))
+
+    def test_inserted_documents_are_found(self):
+        self.assertCountEqual(self.found('web framework'), ['Django', 'Flask'])
+        self.assertEqual(self.found('python framework'), ['Django'])
+        self.assertEqual(self.found('flask'), ['Flask'])
+
+    def test_updated_documents_are_reindexed(self):
+        self.flask.content = 'A Python microframework.'
+        self.flask.save()
+
+        self.assertEqual(self.found('lightweight'), [])
+        self.assertEqual(self.found('microframework'), ['Flask'])
+
+        Document.objects.filter(pk=self.django.pk).update(title='Pyramid')
+        self.assertEqual(self.found('django'), [])
+        self.assertEqual(self.found('pyramid'), ['Pyramid'])
+
+    def test_deleted_documents_are_not_found(self):
+        self.django.delete()
+
+        self.assertEqual(self.found('python'), [])
+        self.assertEqual(self.found('web'), ['Flask'])
+
+    def test_headline_marks_the_matches(self):
+        document = Document.objects.search('python').get()
+
+        self.assertIn('<b>Python</b>', document.headline)
+        self.assertGreater(document.rank, 0)
+
+    def test_blank_search_finds_nothing(self):
+        self.assertEqual(self.found('   '), [])
@@ -0,0 +1,160 @@
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import traceback
+from collections import Counter
+from functools import lru_cache, wraps
+from importlib import import_module
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger('orm_skeleton.n_plus_one')
+
+DEFAULT_OPTIONS = {
+    'ENABLED': False,
+    # Alert when one fingerprint runs more than THRESHOLD times inside one scope
+    'THRESHOLD': 5,
+    # Share of scopes (requests, detected calls) that are tracked at all
+    'SAMPLE_RATE': 1.0,
+    'STACK_DEPTH': 8,
+}
+
+IGNORED_FRAMES = (os.sep + 'django' + os.sep, os.path.abspath(__file__))
+
+_local = threading.local()
+
+
+def get_options():
+    return {**DEFAULT_OPTIONS, **getattr(settings, 'N_PLUS_ONE_DETECTOR', {})}
+
+
+@lru_cache(maxsize=2048)
+def fingerprint(sql):
+    # Literals and IN lists of any length collapse, so author 1 and author 2 give the same fingerprint
+    sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    sql = re.sub(r'%s', '?', sql)
+    sql = re.sub(r'\(\s*\?(?:\s*,\s*\?)*\s*\)', '(...)', sql)
+    return re.sub(r'\s+', ' ', sql).strip()
+
+
+def get_user_stack(depth):
+    # Drop Django's and the detector's own frames, so the alert points at the code that caused it
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if not any(ignored in frame.filename for ignored in IGNORED_FRAMES)
+    ]
+    return ''.join(traceback.format_list(frames[-depth:]))
+
+
+class NPlusOneScope:
+    """Counts the fingerprints of one logical call and logs every one that goes over the threshold."""
+
+    def __init__(self, name, threshold, stack_depth):
+        self.name = name
+        self.threshold = threshold
+        self.stack_depth = stack_depth
+        self.counts = Counter()
+        self.alerts = []
+
+    def __call__(self, execute, sql, params, many, context):
+        key = fingerprint(sql)
+        self.counts[key] += 1
+
+        # Only the first repetition over the threshold pays for the stack walk
+        if self.counts[key] == self.threshold + 1:
+            alert = {'scope': self.name, 'sql': key, 'stack': get_user_stack(self.stack_depth)}
+            self.alerts.append(alert)
+            logger.warning(
+                'Possible N+1 in %s: the same query ran more than %s times\n%s\n%s',
+                self.name, self.threshold, key, alert['stack'],
+            )
+
+        return execute(sql, params, many, context)
+
+    def finish(self):
+        for alert in self.alerts:
+            alert['count'] = self.counts[alert['sql']]
+
+
+class detect_n_plus_one:
+    """
+    Context manager and decorator that tracks one logical call with connection.execute_wrapper().
+    Does nothing unless N_PLUS_ONE_DETECTOR['ENABLED'] is set, and only SAMPLE_RATE of the
+    scopes are tracked. Nested scopes are counted by the outermost one. A scope that is not
+    tracked still returns an NPlusOneScope, which stays empty.
+
+        with detect_n_plus_one('show_all_authors_with_their_books') as scope:
+            show_all_authors_with_their_books()
+        scope.alerts
+    """
+
+    def __init__(self, name=None, using='default', force=False):
+        self.name = name
+        self.using = using
+        self.force = force
+        self.scope = None
+        self.wrapper = None
+
+    def __enter__(self):
+        options = get_options()
+        enabled = self.force or (options['ENABLED'] and random.random() < options['SAMPLE_RATE'])
+
+        if not enabled or getattr(_local, 'scope', None) is not None:
+            return NPlusOneScope(self.name, options['THRESHOLD'], options['STACK_DEPTH'])
+
+        self.scope = NPlusOneScope(self.name, options['THRESHOLD'], options['STACK_DEPTH'])
+        self.wrapper = connections[self.using].execute_wrapper(self.scope)
+        self.wrapper.__enter__()
+        _local.scope = self.scope
+
+        return self.scope
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if self.scope is None:
+            return
+
+        _local.scope = None
+        self.wrapper.__exit__(exc_type, exc_value, tb)
+        self.scope.finish()
+        self.scope = None
+
+    def __call__(self, function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with detect_n_plus_one(self.name or function.__qualname__, self.using, self.force):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+
+class NPlusOneMiddleware:
+    """Tracks every request (e.g. an admin changelist) as one scope."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with detect_n_plus_one(f'{request.method} {request.path}'):
+            return self.get_response(request)
+
+
+if __name__ == '__main__':
+    # python -m orm_skeleton.n_plus_one <caller function> [argument ...]
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
+    django.setup()
+    logging.basicConfig(format='%(message)s')
+
+    function_name, *arguments = sys.argv[1:]
+
+    with detect_n_plus_one(function_name, force=True) as detected:
+        getattr(import_module('caller'), function_name)(*arguments)
+
+    for alert in detected.alerts:
+        print(f"{alert['count']} x {alert['sql']}")
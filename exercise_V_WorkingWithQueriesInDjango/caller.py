@@ -11,7 +11,7 @@ from main_app.models import ArtworkGallery, Laptop, ChessPlayer, Meal, Dungeon,
 from typing import List
 from main_app.choices import OperationSystemsChoices, LaptopBrandChoices, MealTypeChoices, DungeonDifficultyChoices, \
     WorkoutTypeChoices
-from django.db.models import When, Case, Value, F, TextField, CharField, IntegerField, QuerySet
+from django.db.models import When, Case, Value, F, TextField, CharField, QuerySet
 
 
 # Create and check models
@@ -146,6 +146,17 @@ def grand_chess_title_FM() -> None:
 def grand_chess_title_regular_player() -> None:
     ChessPlayer.objects.filter(rating__lte=2199).update(title='regular player')
 
+TITLE_RATINGS = [2200, 2300, 2400]
+TITLES = ['regular player', 'FM', 'IM', 'GM']
+
+def grand_chess_titles() -> int:
+    # All four titles above in one UPDATE
+    return ChessPlayer.objects.band('rating', TITLE_RATINGS, TITLES, 'title')
+
+def regrand_chess_titles() -> int:
+    # Only players saved since the previous call
+    return ChessPlayer.objects.reband('rating', TITLE_RATINGS, TITLES, 'title', 'last_edited_on')
+
 
 # player1 = ChessPlayer(
 #     username='Player1',
@@ -177,16 +188,24 @@ def grand_chess_title_regular_player() -> None:
 
 
 def set_new_chefs() -> None:
-    Meal.objects.filter(meal_type=MealTypeChoices.BREAKFAST).update(chef='Gordon Ramsay')
-    Meal.objects.filter(meal_type=MealTypeChoices.LUNCH).update(chef='Julia Child')
-    Meal.objects.filter(meal_type=MealTypeChoices.DINNER).update(chef='Jamie Oliver')
-    Meal.objects.filter(meal_type=MealTypeChoices.SNACK).update(chef='Thomas Keller')
+    Meal.objects.remap('meal_type', {
+        'chef': {
+            MealTypeChoices.BREAKFAST: 'Gordon Ramsay',
+            MealTypeChoices.LUNCH: 'Julia Child',
+            MealTypeChoices.DINNER: 'Jamie Oliver',
+            MealTypeChoices.SNACK: 'Thomas Keller',
+        },
+    })
 
 def set_new_preparation_times() -> None:
-    Meal.objects.filter(meal_type=MealTypeChoices.BREAKFAST).update(preparation_time='10 minutes')
-    Meal.objects.filter(meal_type=MealTypeChoices.LUNCH).update(preparation_time='12 minutes')
-    Meal.objects.filter(meal_type=MealTypeChoices.DINNER).update(preparation_time='15 minutes')
-    Meal.objects.filter(meal_type=MealTypeChoices.SNACK).update(preparation_time='5 minutes')
+    Meal.objects.remap('meal_type', {
+        'preparation_time': {
+            MealTypeChoices.BREAKFAST: '10 minutes',
+            MealTypeChoices.LUNCH: '12 minutes',
+            MealTypeChoices.DINNER: '15 minutes',
+            MealTypeChoices.SNACK: '5 minutes',
+        },
+    })
 
 def update_low_calorie_meals() -> None:
     Meal.objects.filter(meal_type__in=[MealTypeChoices.BREAKFAST, MealTypeChoices.DINNER]).update(calories=400)
@@ -239,28 +258,25 @@ def bulk_create_dungeons(args: List[Dungeon]) -> None:
     Dungeon.objects.bulk_create(args)
 
 def update_dungeon_names() -> None:
-    Dungeon.objects.update(
-        name=Case(
-            When(difficulty=DungeonDifficultyChoices.EASY, then=Value('The Erased Thombs')),
-            When(difficulty=DungeonDifficultyChoices.MEDIUM, then=Value('The Coral Labyrinth')),
-            When(difficulty=DungeonDifficultyChoices.HARD, then=Value('The Lost Haunt')),
-            default=F('name')
-        )
-    )
+    Dungeon.objects.remap('difficulty', {
+        'name': {
+            DungeonDifficultyChoices.EASY: 'The Erased Thombs',
+            DungeonDifficultyChoices.MEDIUM: 'The Coral Labyrinth',
+            DungeonDifficultyChoices.HARD: 'The Lost Haunt',
+        },
+    })
 
 def update_dungeon_bosses_health() -> None:
     Dungeon.objects.exclude(difficulty=DungeonDifficultyChoices.EASY).update(boss_health=500)
 
 def update_dungeon_recommended_levels() -> None:
-    Dungeon.objects.update(
-        recommended_level=Case(
-            When(difficulty=DungeonDifficultyChoices.EASY, then=Value(25)),
-            When(difficulty=DungeonDifficultyChoices.MEDIUM, then=Value(50)),
-            When(difficulty=DungeonDifficultyChoices.HARD, then=Value(75)),
-            default=F('recommended_level'),
-            output_field=IntegerField()
-        )
-    )
+    Dungeon.objects.remap('difficulty', {
+        'recommended_level': {
+            DungeonDifficultyChoices.EASY: 25,
+            DungeonDifficultyChoices.MEDIUM: 50,
+            DungeonDifficultyChoices.HARD: 75,
+        },
+    })
 
 def update_dungeon_rewards() -> None:
     Dungeon.objects.update(
@@ -274,14 +290,13 @@ def update_dungeon_rewards() -> None:
     )
 
 def set_new_locations() -> None:
-    Dungeon.objects.update(
-        location=Case(
-            When(recommended_level=25, then=Value('Enchanted Maze')),
-            When(recommended_level=50, then=Value('Grimstone Mines')),
-            When(recommended_level=75, then=Value('Shadowed Abyss')),
-            default=F('location')
-        )
-    )
+    Dungeon.objects.remap('recommended_level', {
+        'location': {
+            25: 'Enchanted Maze',
+            50: 'Grimstone Mines',
+            75: 'Shadowed Abyss',
+        },
+    })
 
 
 # # Create two instances
@@ -336,26 +351,26 @@ def get_high_difficulty_cardio_workouts() -> QuerySet:
     return Workout.objects.filter(workout_type=WorkoutTypeChoices.CARDIO, difficulty=DungeonDifficultyChoices.HARD).order_by('instructor')
 
 def set_new_instructors() -> None:
-    Workout.objects.update(
-        instructor=Case(
-            When(workout_type=WorkoutTypeChoices.CARDIO, then=Value('John Smith')),
-            When(workout_type=WorkoutTypeChoices.STRENGTH, then=Value('Michael Williams')),
-            When(workout_type=WorkoutTypeChoices.YOGA, then=Value('Emily Johnson')),
-            When(workout_type=WorkoutTypeChoices.CROSSFIT, then=Value('Sarah Davis')),
-            When(workout_type=WorkoutTypeChoices.CALISTHENICS, then=Value('Chris Heria')),
-        )
-    )
+    Workout.objects.remap('workout_type', {
+        'instructor': {
+            WorkoutTypeChoices.CARDIO: 'John Smith',
+            WorkoutTypeChoices.STRENGTH: 'Michael Williams',
+            WorkoutTypeChoices.YOGA: 'Emily Johnson',
+            WorkoutTypeChoices.CROSSFIT: 'Sarah Davis',
+            WorkoutTypeChoices.CALISTHENICS: 'Chris Heria',
+        },
+    })
 
 def set_new_duration_times() -> None:
-    Workout.objects.update(
-        duration=Case(
-            When(instructor='John Smith', then=Value('15 minutes')),
-            When(instructor='Sarah Davis', then=Value('30 minutes')),
-            When(instructor='Chris Heria', then=Value('45 minutes')),
-            When(instructor='Michael Williams', then=Value('1 hour')),
-            When(instructor='Emily Johnson', then=Value('1 hour and 30 minutes')),
-        )
-    )
+    Workout.objects.remap('instructor', {
+        'duration': {
+            'John Smith': '15 minutes',
+            'Sarah Davis': '30 minutes',
+            'Chris Heria': '45 minutes',
+            'Michael Williams': '1 hour',
+            'Emily Johnson': '1 hour and 30 minutes',
+        },
+    })
 
 def delete_workouts() -> None:
     Workout.objects.exclude(workout_type__in=[WorkoutTypeChoices.STRENGTH, WorkoutTypeChoices.CALISTHENICS]).delete()
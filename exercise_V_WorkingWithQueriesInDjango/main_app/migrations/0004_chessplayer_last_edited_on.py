@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_laptop'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chessplayer',
+            name='last_edited_on',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
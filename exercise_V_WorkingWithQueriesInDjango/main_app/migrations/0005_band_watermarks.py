@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0004_chessplayer_last_edited_on'),
+    ]
+
+    operations = [
+        # Watermarks of SetBasedQuerySet.reband(), read and written with raw SQL
+        migrations.RunSQL(
+            'CREATE TABLE band_watermarks (name varchar(255) PRIMARY KEY, watermark varchar(255) NOT NULL)',
+            'DROP TABLE band_watermarks',
+        ),
+    ]
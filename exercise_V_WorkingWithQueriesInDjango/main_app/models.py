@@ -1,6 +1,7 @@
 from django.db import models
 from main_app.choices import OperationSystemsChoices, LaptopBrandChoices, MealTypeChoices, WorkoutTypeChoices, \
     DungeonDifficultyChoices
+from orm_skeleton.set_based_updates import SetBasedQuerySet
 
 
 # Create your models here.
@@ -13,6 +14,9 @@ class ChessPlayer(models.Model):
     games_won = models.PositiveIntegerField(default=0)
     games_lost = models.PositiveIntegerField(default=0)
     games_drawn = models.PositiveIntegerField(default=0)
+    last_edited_on = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = SetBasedQuerySet.as_manager()
 
 
 class Meal(models.Model):
@@ -23,6 +27,8 @@ class Meal(models.Model):
     calories = models.PositiveIntegerField()
     chef = models.CharField(max_length=100)
 
+    objects = SetBasedQuerySet.as_manager()
+
 
 class Dungeon(models.Model):
     name = models.CharField(max_length=100)
@@ -33,6 +39,8 @@ class Dungeon(models.Model):
     boss_health = models.PositiveIntegerField()
     reward = models.TextField()
 
+    objects = SetBasedQuerySet.as_manager()
+
 
 class Workout(models.Model):
     name = models.CharField(max_length=200)
@@ -42,6 +50,8 @@ class Workout(models.Model):
     calories_burned = models.PositiveIntegerField()
     instructor = models.CharField(max_length=100)
 
+    objects = SetBasedQuerySet.as_manager()
+
 
 class ArtworkGallery(models.Model):
     artist_name = models.CharField(
@@ -1,3 +1,84 @@
+from datetime import timedelta
+
+from django.db.models import Max
 from django.test import TestCase
 
-# Create your tests here.
+from main_app.models import ChessPlayer, Meal
+
+TITLE_RATINGS = [2200, 2300, 2400]
+TITLES = ['regular player', 'FM', 'IM', 'GM']
+
+
+class BandTests(TestCase):
+    def setUp(self):
+        for username, rating in [('a', 2100), ('b', 2250), ('c', 2350), ('d', 2450)]:
+            ChessPlayer.objects.create(username=username, rating=rating)
+
+    def titles(self):
+        return dict(ChessPlayer.objects.values_list('username', 'title'))
+
+    def reband(self):
+        return ChessPlayer.objects.reband('rating', TITLE_RATINGS, TITLES, 'title', 'last_edited_on')
+
+    def move_last_edited_on(self, username, delta):
+        # QuerySet.update() does not stamp auto_now, so this places the row anywhere in time
+        high = ChessPlayer.objects.aggregate(high=Max('last_edited_on'))['high']
+        ChessPlayer.objects.filter(username=username).update(rating=2410, last_edited_on=high + delta)
+
+    def test_band_writes_only_rows_with_a_wrong_label(self):
+        self.assertEqual(ChessPlayer.objects.band('rating', TITLE_RATINGS, TITLES, 'title'), 4)
+        self.assertEqual(self.titles(), {'a': 'regular player', 'b': 'FM', 'c': 'IM', 'd': 'GM'})
+        self.assertEqual(ChessPlayer.objects.band('rating', TITLE_RATINGS, TITLES, 'title'), 0)
+
+    def test_reband_picks_up_only_changed_rows(self):
+        self.assertEqual(self.reband(), 4)
+
+        player = ChessPlayer.objects.get(username='a')
+        player.rating = 2320
+        player.save()
+        self.move_last_edited_on('b', -timedelta(hours=1))
+
+        self.assertEqual(self.reband(), 1)
+        self.assertEqual(self.titles(), {'a': 'IM', 'b': 'FM', 'c': 'IM', 'd': 'GM'})
+
+    def test_reband_rescans_the_overlap_below_the_watermark(self):
+        self.reband()
+
+        # Committed after the previous call, but stamped before its watermark
+        self.move_last_edited_on('a', -timedelta(minutes=1))
+
+        self.assertEqual(self.reband(), 1)
+        self.assertEqual(self.titles()['a'], 'GM')
+
+
+class RemapTests(TestCase):
+    def setUp(self):
+        for meal_type in ['Breakfast', 'Lunch', 'Dinner']:
+            Meal.objects.create(
+                name=meal_type, meal_type=meal_type, preparation_time='1 hour', difficulty=1, calories=100, chef='Cook',
+            )
+
+    def meals(self):
+        return {name: (chef, time) for name, chef, time in Meal.objects.values_list('name', 'chef', 'preparation_time')}
+
+    def test_columns_are_remapped_in_one_update(self):
+        rows = Meal.objects.remap('meal_type', {
+            'chef': {'Breakfast': 'Gordon Ramsay', 'Lunch': 'Julia Child'},
+            'preparation_time': {'Breakfast': '10 minutes'},
+        })
+
+        self.assertEqual(rows, 2)
+        self.assertEqual(self.meals(), {
+            'Breakfast': ('Gordon Ramsay', '10 minutes'),
+            'Lunch': ('Julia Child', '1 hour'),
+            'Dinner': ('Cook', '1 hour'),
+        })
+
+    def test_only_the_queryset_rows_are_remapped(self):
+        Meal.objects.exclude(name='Lunch').remap('meal_type', {'chef': {'Breakfast': 'A', 'Lunch': 'B'}})
+
+        self.assertEqual(self.meals()['Breakfast'][0], 'A')
+        self.assertEqual(self.meals()['Lunch'][0], 'Cook')
+
+    def test_empty_mappings_update_nothing(self):
+        self.assertEqual(Meal.objects.remap('meal_type', {'chef': {}}), 0)
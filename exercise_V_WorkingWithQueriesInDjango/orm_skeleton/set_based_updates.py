@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.db import connections, models, transaction
+from django.db.models import Case, F, Max, Q, Value, When
+
+# Created by a migration, one row per reband() name
+WATERMARK_TABLE = 'band_watermarks'
+# How far below its watermark reband() looks again for rows of transactions that committed late
+RESCAN_OVERLAP = timedelta(minutes=5)
+
+
+class SetBasedQuerySet(models.QuerySet):
+    def remap(self, key_field, mappings):
+        """
+        Rewrite columns by looking up each row's key_field value, all columns in one UPDATE:
+
+            Meal.objects.remap('meal_type', {
+                'chef': {'Breakfast': 'Gordon Ramsay', 'Lunch': 'Julia Child'},
+                'preparation_time': {'Breakfast': '10 minutes'},
+            })
+
+        Rows whose key is not in any mapping are not touched, a column keeps its value for keys
+        missing from its own mapping. Returns the number of rows updated.
+        """
+        keys = list(dict.fromkeys(key for mapping in mappings.values() for key in mapping))
+
+        if not keys:
+            return 0
+
+        return self.filter(**{f'{key_field}__in': keys}).update(**{
+            column: Case(
+                *[When(**{key_field: key}, then=Value(value)) for key, value in mapping.items()],
+                default=F(column),
+                output_field=self.model._meta.get_field(column),
+            )
+            for column, mapping in mappings.items()
+        })
+
+    def band(self, source, breakpoints, labels, target):
+        """
+        Write into target the label of the range source falls in, in one UPDATE:
+
+            ChessPlayer.objects.band('rating', [2200, 2300, 2400], ['regular player', 'FM', 'IM', 'GM'], 'title')
+
+        labels[0] is for values below breakpoints[0], labels[i] for values from breakpoints[i - 1]
+        up to breakpoints[i]. Rows that already have their label are not written. Returns the number of rows updated.
+        """
+        breakpoints = list(breakpoints)
+
+        if breakpoints != sorted(breakpoints) or len(labels) != len(breakpoints) + 1:
+            raise ValueError("band needs ascending breakpoints and one label more than breakpoints.")
+
+        label = Case(
+            *[
+                When(**{f'{source}__gte': breakpoint}, then=Value(band_label))
+                for breakpoint, band_label in reversed(list(zip(breakpoints, labels[1:])))
+            ],
+            default=Value(labels[0]),
+            output_field=self.model._meta.get_field(target),
+        )
+
+        return self.filter(~Q(**{target: label})).update(**{target: label})
+
+    def reband(self, source, breakpoints, labels, target, changed_field, name=None, overlap=None):
+        """
+        band() only the rows whose changed_field (an indexed auto_now timestamp or a counter) moved
+        past the watermark left by the previous call. Writes that change source with QuerySet.update()
+        must set changed_field too.
+
+        auto_now is stamped by the writer before it commits, so a slow transaction can commit rows
+        stamped below a watermark that was already saved. Each call therefore rescans `overlap`
+        (RESCAN_OVERLAP for timestamps) below the watermark, which must be longer than the longest
+        writing transaction. Rescanned rows that already have their label are not written again.
+        """
+        name = name or f'{self.model._meta.label}.{target}'
+        field = self.model._meta.get_field(changed_field)
+
+        if overlap is None:
+            overlap = RESCAN_OVERLAP if isinstance(field, models.DateTimeField) else 0
+
+        with transaction.atomic(using=self.db):
+            watermark = get_watermark(self.db, name)
+            high = self.aggregate(high=Max(changed_field))['high']
+
+            if high is None:
+                return 0
+
+            queryset = self.filter(**{f'{changed_field}__lte': high})
+            if watermark is not None:
+                queryset = queryset.filter(**{f'{changed_field}__gt': field.to_python(watermark) - overlap})
+
+            rows = queryset.band(source, breakpoints, labels, target)
+            save_watermark(self.db, name, str(high))
+
+        return rows
+
+
+def get_watermark(using, name):
+    connection = connections[using]
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT watermark FROM {connection.ops.quote_name(WATERMARK_TABLE)} WHERE name = %s", [name])
+        row = cursor.fetchone()
+
+    return row[0] if row else None
+
+
+def save_watermark(using, name, watermark):
+    connection = connections[using]
+    table = connection.ops.quote_name(WATERMARK_TABLE)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE name = %s", [name])
+        cursor.execute(f"INSERT INTO {table} (name, watermark) VALUES (%s, %s)", [name, watermark])
@@ -3,27 +3,40 @@ import random
 
 from django.db import migrations
 
-def add_barcode(apps, schema_editor):
-    Product = apps.get_model('main_app', 'Product')
-    products = Product.objects.all()
-    barcode = random.sample(range(100000000, 1000000000), len(products))
-    for i in range(len(products)):
-        p = products[i]
-        p.barcode = barcode[i]
-        p.save()
-
-def remove_barcode(apps, schema_editor):
-    Product = apps.get_model('main_app', 'Product')
-    for p in Product.objects.all():
+from orm_skeleton.batched_migrations import BatchedRunPython
+
+def add_barcode(products):
+    # Candidates already in the table are drawn again, so barcodes of chunks committed
+    # before, also by a run that was interrupted, are never issued twice
+    Product = type(products[0])
+    issued = Product._base_manager.using(products[0]._state.db)
+    barcodes = set()
+
+    while len(barcodes) < len(products):
+        candidates = set(random.sample(range(100000000, 1000000000), len(products) - len(barcodes))) - barcodes
+        candidates -= set(issued.filter(barcode__in=candidates).values_list('barcode', flat=True))
+        barcodes |= candidates
+
+    for p, barcode in zip(products, barcodes):
+        p.barcode = barcode
+
+def remove_barcode(products):
+    for p in products:
         p.barcode = None
-        p.save()
 
 class Migration(migrations.Migration):
+    # Every chunk of products commits on its own
+    atomic = False
 
     dependencies = [
         ('main_app', '0005_product_barcode_alter_product_created_on'),
     ]
 
     operations = [
-        migrations.RunPython(add_barcode, reverse_code=remove_barcode)
+        BatchedRunPython(
+            'Product',
+            callback=add_barcode,
+            reverse_callback=remove_barcode,
+            fields=['barcode'],
+        )
     ]
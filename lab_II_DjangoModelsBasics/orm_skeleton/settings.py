@@ -49,8 +49,16 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'orm_skeleton.n_plus_one.NPlusOneMiddleware',
 ]
 
+# Logs queries that repeat more than THRESHOLD times in one request or detected call
+N_PLUS_ONE_DETECTOR = {
+    'ENABLED': False,
+    'THRESHOLD': 5,
+    'SAMPLE_RATE': 1.0,
+}
+
 ROOT_URLCONF = 'orm_skeleton.urls'
 
 TEMPLATES = [
@@ -2,8 +2,6 @@ import os
 import django
 from datetime import date
 
-from django.template.defaultfilters import lower
-
 # Set up Django
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
 django.setup()
@@ -56,11 +54,9 @@ def get_students_info():
 # print(get_students_info())
 
 def update_students_emails():
-    all = Student.objects.all()
-    for student in all:
-        student.email = f"{lower(student.first_name)}.{lower(student.last_name)}@uni-students.com"
-        # student.save()
-    Student.objects.bulk_update(all, ['email'])
+    Student.objects.update_with(
+        email=lambda student: f"{student.first_name.lower()}.{student.last_name.lower()}@uni-students.com"
+    )
 
 # update_students_emails()
 # for student in Student.objects.all():
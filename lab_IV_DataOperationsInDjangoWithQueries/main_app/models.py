@@ -1,5 +1,7 @@
 from django.db import models
 
+from orm_skeleton.expression_compiler import UpdateWithQuerySet
+
 class Student(models.Model):
     student_id = models.CharField(max_length=10, unique=True, primary_key=True)
     first_name = models.CharField(max_length=50)
@@ -7,5 +9,7 @@ class Student(models.Model):
     birth_date = models.DateField(null=True, blank=True)
     email = models.EmailField(unique=True)
 
+    objects = UpdateWithQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -1,25 +1,194 @@
 import os
+import sys
+import copy
+import json
+import struct
+import hashlib
+import zlib
 import zipfile
 import datetime
+from concurrent.futures import ProcessPoolExecutor
 
-def pack():
-    # Remove old archive
-    for item in os.listdir('.'):
-        if item.endswith(".zip"):
-            os.remove(item)
+IGNORED_DIRS = {'.venv', 'venv', '__pycache__', '.git', '.idea'}
+PACKED_FILES = ['requirements.txt', 'manage.py', 'caller.py']
+PACKED_DIRS = ['main_app', 'orm_skeleton', 'migrations']
+MANIFEST_FILE = '.pack_manifest.json'
 
-    dt = datetime.datetime.now().strftime('%H-%M_%d.%m.%y')
-    with zipfile.ZipFile(f'submission-{dt}.zip', 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, dirs, files in os.walk(os.getcwd()):
-            for file in files:
+
+def iter_packed_files(base_dir):
+    for root, dirs, files in os.walk(base_dir):
+        # Prune in place so ignored trees such as .venv are never descended into
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+        current_dir = os.path.basename(root)
+
+        for file in sorted(files):
+            if file in PACKED_FILES or current_dir in PACKED_DIRS:
                 file_path = os.path.join(root, file)
-                archive_path = os.path.relpath(file_path, os.getcwd())
-                current_dir = os.path.basename(root)
-                if file in ['requirements.txt', 'manage.py', 'caller.py']\
-                        or current_dir in ['main_app', 'orm_skeleton', 'migrations'] and ('__pycache__' and '.venv') not in root:
+                yield file_path, os.path.relpath(file_path, base_dir)
+
+
+def file_digest(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(base_dir):
+    try:
+        with open(os.path.join(base_dir, MANIFEST_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'archive': None, 'files': {}}
+
+
+def save_manifest(base_dir, manifest):
+    with open(os.path.join(base_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def write_compressed_entry(target, info, data):
+    # Append a member whose data is already deflated, CRC and sizes must be set on info
+    info.header_offset = target.fp.tell()
+    target.fp.write(info.FileHeader())
+    target.fp.write(data)
+    target.filelist.append(info)
+    target.NameToInfo[info.filename] = info
+    target.start_dir = target.fp.tell()
+
+
+def copy_compressed_entry(source, target, info):
+    # Copy an already deflated member byte for byte instead of recompressing it
+    source.fp.seek(info.header_offset)
+    header = source.fp.read(zipfile.sizeFileHeader)
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    source.fp.seek(info.header_offset + zipfile.sizeFileHeader + name_length + extra_length)
+    data = source.fp.read(info.compress_size)
+
+    write_compressed_entry(target, copy.copy(info), data)
+
+
+def compress_file(file_path, archive_path):
+    # Runs in a worker process: deflate is CPU bound and would be serialized by the GIL in threads
+    info = zipfile.ZipInfo.from_file(file_path, archive_path)
+    info.compress_type = zipfile.ZIP_DEFLATED
+
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+    data = compressor.compress(raw) + compressor.flush()
+
+    info.file_size = len(raw)
+    info.compress_size = len(data)
+    info.CRC = zlib.crc32(raw)
+
+    return info, data
+
+
+def find_projects(root):
+    return sorted(
+        os.path.join(root, item) for item in os.listdir(root)
+        if os.path.isfile(os.path.join(root, item, 'manage.py'))
+    )
+
+
+def pack_all(root=None, workers=None):
+    """
+    Pack every project under root (a directory with a manage.py) into its own submission archive.
+    Files of all projects are compressed in one shared process pool and each archive is written
+    by streaming the pre-compressed members, so the run scales with the number of cores.
+    """
+    root = root or os.getcwd()
+    dt = datetime.datetime.now().strftime('%H-%M_%d.%m.%y')
+    projects = find_projects(root)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Submit everything first, so the pool stays busy while archives are being written
+        jobs = [
+            (project, [executor.submit(compress_file, file_path, archive_path)
+                       for file_path, archive_path in iter_packed_files(project)])
+            for project in projects
+        ]
+
+        for project, futures in jobs:
+            remove_old_archives(project)
+
+            with zipfile.ZipFile(os.path.join(project, f'submission-{dt}.zip'), 'w', zipfile.ZIP_DEFLATED) as zipf:
+                for future in futures:
+                    write_compressed_entry(zipf, *future.result())
+
+    print(f'Submissions created for {len(projects)} projects!')
+    return projects
+
+
+def remove_old_archives(base_dir, keep=None):
+    for item in os.listdir(base_dir):
+        if item.endswith(".zip") and item != keep:
+            os.remove(os.path.join(base_dir, item))
+
+
+def pack(incremental=False, base_dir=None):
+    base_dir = base_dir or os.getcwd()
+    dt = datetime.datetime.now().strftime('%H-%M_%d.%m.%y')
+    archive_name = f'submission-{dt}.zip'
+
+    if not incremental:
+        # Remove old archive
+        remove_old_archives(base_dir)
+
+        with zipfile.ZipFile(os.path.join(base_dir, archive_name), 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for file_path, archive_path in iter_packed_files(base_dir):
+                zipf.write(file_path, archive_path)
+
+        print('Submission created!')
+        return archive_name
+
+    manifest = load_manifest(base_dir)
+    previous_path = os.path.join(base_dir, manifest['archive']) if manifest['archive'] else None
+    previous = zipfile.ZipFile(previous_path) if previous_path and os.path.exists(previous_path) else None
+
+    # Same minute as the previous run: write next to it and swap afterwards
+    target_name = archive_name if archive_name != manifest['archive'] else f'.{archive_name}.tmp'
+    files = {}
+    reused = 0
+
+    try:
+        with zipfile.ZipFile(os.path.join(base_dir, target_name), 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for file_path, archive_path in iter_packed_files(base_dir):
+                stat = os.stat(file_path)
+                entry = manifest['files'].get(archive_path)
+                previous_info = previous.NameToInfo.get(archive_path) if previous else None
+
+                if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                    digest = entry['sha256']
+                else:
+                    digest = file_digest(file_path)
+
+                if previous_info and entry and entry['sha256'] == digest:
+                    copy_compressed_entry(previous, zipf, previous_info)
+                    reused += 1
+                else:
                     zipf.write(file_path, archive_path)
 
-    print('Submission created!')
+                files[archive_path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest}
+    finally:
+        if previous:
+            previous.close()
+
+    if target_name != archive_name:
+        os.replace(os.path.join(base_dir, target_name), os.path.join(base_dir, archive_name))
+
+    remove_old_archives(base_dir, keep=archive_name)
+    save_manifest(base_dir, {'archive': archive_name, 'files': files})
+
+    print(f'Submission created! ({reused} of {len(files)} files reused)')
+    return archive_name
+
 
 if __name__ == '__main__':
-    pack()
\ No newline at end of file
+    if '--all' in sys.argv:
+        pack_all()
+    else:
+        pack(incremental='--incremental' in sys.argv)
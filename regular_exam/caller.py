@@ -10,15 +10,24 @@ django.setup()
 
 # Import your models here
 from main_app.models import Publisher, Author, Book
+from main_app.leaderboards import top_main_authors, authors_by_books_count
+from orm_skeleton.counter_cache import reconcile_counter_caches
 from orm_skeleton.helpers import populate_model_with_data
+from orm_skeleton.leaderboards import read_leaderboard
+from orm_skeleton.parallel_seeding import seed_models_in_parallel
 from django.db.models import Q, Count, Avg, F, Value
 
 
 # Create queries within functions
-def populate_db() -> None:
-    populate_model_with_data(Publisher)
-    populate_model_with_data(Author)
-    populate_model_with_data(Book)
+def populate_db(num_records=10, workers=None) -> None:
+    if workers:
+        seed_models_in_parallel({Publisher: num_records, Author: num_records, Book: num_records}, workers=workers)
+        return
+
+    populate_model_with_data(Publisher, num_records)
+    populate_model_with_data(Author, num_records)
+    populate_model_with_data(Book, num_records)
+    reconcile_counter_caches()
 
 def get_publishers(search_string=None) -> str:
     if search_string is None:
@@ -42,8 +51,11 @@ def get_publishers(search_string=None) -> str:
         f'rating: {p.rating:.1f}' for p in publishers
     )
 
-def get_top_publisher() -> str:
-    publisher = Publisher.objects.get_publishers_by_books_count().first()
+def get_top_publisher(from_leaderboard=False) -> str:
+    if from_leaderboard:
+        publisher = next(iter(read_leaderboard('top_publishers', 1)), None)
+    else:
+        publisher = Publisher.objects.get_publishers_by_books_count().first()
 
     if publisher:
         return f"Top Publisher: {publisher.name} with {publisher.books_count} books."
@@ -51,21 +63,18 @@ def get_top_publisher() -> str:
     return "No publishers found."
 
 
-def get_top_main_author() -> str:
-    main_author = Author.objects.annotate(
-        books_count=Count('main_books'),
-        books_avg_rating=Avg('main_books__rating')
-    ).filter(
-        books_count__gt=0
-    ).order_by(
-        '-books_count',
-        'name'
-    ).first()
+def get_top_main_author(from_leaderboard=False) -> str:
+    if from_leaderboard:
+        main_author = next(iter(read_leaderboard('top_main_authors', 1)), None)
+    else:
+        main_author = top_main_authors().first()
 
     if not main_author:
         return "No results."
 
-    book_titles_lst = main_author.main_books.order_by('title').values_list('title', flat=True)
+    book_titles_lst = Book.objects.filter(
+        main_author_id=main_author.id
+    ).order_by('title').values_list('title', flat=True)
     book_titles = ', '.join(book_titles_lst)
 
 
@@ -74,15 +83,11 @@ def get_top_main_author() -> str:
             f"books average rating: {main_author.books_avg_rating:.1f}")
 
 
-def get_authors_by_books_count() -> str:
-    authors = Author.objects.annotate(
-        num_books=Count('main_books', distinct=True) + Count('co_books', distinct=True)
-    ).filter(
-        num_books__gt=0
-    ).order_by(
-        '-num_books',
-        'name'
-    )[:3]
+def get_authors_by_books_count(from_leaderboard=False) -> str:
+    if from_leaderboard:
+        authors = read_leaderboard('authors_by_books_count', 3)
+    else:
+        authors = authors_by_books_count()[:3]
 
     if not authors:
         return "No results."
@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class MainAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'main_app'
+
+    def ready(self):
+        from orm_skeleton.leaderboards import build_missing_leaderboards
+
+        post_migrate.connect(build_missing_leaderboards, sender=self)
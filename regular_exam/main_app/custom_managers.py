@@ -1,12 +1,12 @@
 from django.db import models
-from django.db.models import Count
 
+from orm_skeleton.trigram_search import SearchableQuerySet
 
-class PublisherManager(models.Manager):
+
+class PublisherManager(models.Manager.from_queryset(SearchableQuerySet)):
     def get_publishers_by_books_count(self):
-        return self.annotate(
-            books_count=Count('books')
-        ).order_by(
+        # books_count is a counter cache column, no join and aggregate needed
+        return self.order_by(
             '-books_count',
             'name'
         )
\ No newline at end of file
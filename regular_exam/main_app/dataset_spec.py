@@ -0,0 +1,23 @@
+from datetime import datetime
+
+from orm_skeleton.scale_factor import Zipf, LongTail, Bursty
+from main_app.models import Publisher, Author, Book
+
+
+# Benchmark dataset for get_top_publisher, get_top_main_author, get_authors_by_books_count, get_bestseller
+DATASET_SPEC = {
+    'seed': 20251129,
+    'models': [
+        (Publisher, {'share': 0.02}),
+        (Author, {'share': 0.18}),
+        (Book, {
+            'share': 0.80,
+            'profiles': {
+                'publisher': Zipf(1.1),
+                'main_author': Zipf(1.2),
+                'co_authors': LongTail(1.5),
+                'publication_date': Bursty(bursts=12, start=datetime(2020, 1, 1), end=datetime(2026, 1, 1)),
+            },
+        }),
+    ],
+}
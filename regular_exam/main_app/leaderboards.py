@@ -0,0 +1,49 @@
+from django.db.models import Count, Avg
+
+from main_app.models import Publisher, Author, Book
+from orm_skeleton.leaderboards import Leaderboard
+
+
+def top_main_authors():
+    return Author.objects.annotate(
+        books_count=Count('main_books'),
+        books_avg_rating=Avg('main_books__rating')
+    ).filter(
+        books_count__gt=0
+    ).order_by(
+        '-books_count',
+        'name'
+    )
+
+
+def authors_by_books_count():
+    return Author.objects.annotate(
+        num_books=Count('main_books', distinct=True) + Count('co_books', distinct=True)
+    ).filter(
+        num_books__gt=0
+    ).order_by(
+        '-num_books',
+        'name'
+    )
+
+
+Leaderboard(
+    'top_publishers',
+    lambda: Publisher.objects.get_publishers_by_books_count(),
+    fields=['id', 'name', 'books_count'],
+    depends_on=[Publisher, Book],
+)
+
+Leaderboard(
+    'top_main_authors',
+    top_main_authors,
+    fields=['id', 'name', 'books_count', 'books_avg_rating'],
+    depends_on=[Author, Book],
+)
+
+Leaderboard(
+    'authors_by_books_count',
+    authors_by_books_count,
+    fields=['id', 'name', 'num_books'],
+    depends_on=[Author, Book],
+)
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:58
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations
+
+from orm_skeleton.trigram_search import AddTrigramIndex, create_trigram_extension
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0002_publisher_books_count'),
+    ]
+
+    operations = [
+        # Both operations only touch PostgreSQL
+        migrations.RunPython(create_trigram_extension, migrations.RunPython.noop),
+        AddTrigramIndex(
+            model_name='publisher',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='publisher_name_trgm'),
+        ),
+        AddTrigramIndex(
+            model_name='publisher',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('country'), name='gin_trgm_ops'), name='publisher_country_trgm'),
+        ),
+    ]
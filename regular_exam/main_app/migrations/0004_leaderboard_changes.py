@@ -0,0 +1,16 @@
+from django.db import migrations
+
+from orm_skeleton.leaderboards import TrackLeaderboardChanges
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_trigram_search_indexes'),
+    ]
+
+    operations = [
+        TrackLeaderboardChanges(
+            tables=['main_app_author', 'main_app_book', 'main_app_book_co_authors', 'main_app_publisher'],
+        ),
+    ]
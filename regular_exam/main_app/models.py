@@ -4,6 +4,8 @@ from django.core.validators import MinLengthValidator, MinValueValidator, MaxVal
 from django.db import models
 
 from main_app.custom_managers import PublisherManager
+from orm_skeleton.counter_cache import CounterCacheField
+from orm_skeleton.trigram_search import trigram_indexes
 
 
 # Create your models here.
@@ -28,9 +30,16 @@ class Publisher(models.Model):
             MaxValueValidator(5.0)
         ]
     )
+    books_count = CounterCacheField(
+        'Book',
+        'publisher'
+    )
 
     objects = PublisherManager()
 
+    class Meta:
+        indexes = trigram_indexes('publisher', ['name', 'country'])
+
     def __str__(self):
         return self.name
 
@@ -0,0 +1,8 @@
+# Maximum number of queries per report function in caller.py, independent of the row count
+QUERY_BUDGETS = {
+    'get_publishers': {'queries': 2, 'args': ('Publisher 1',)},
+    'get_top_publisher': {'queries': 1},
+    'get_top_main_author': {'queries': 2},
+    'get_authors_by_books_count': {'queries': 1},
+    'get_bestseller': {'queries': 4},
+}
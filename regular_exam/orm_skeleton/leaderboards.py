@@ -0,0 +1,265 @@
+import os
+import sys
+import time
+from importlib import import_module
+from types import SimpleNamespace
+
+from django.db import connections, transaction
+from django.db.migrations.operations.base import Operation
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+
+LEADERBOARDS = {}
+
+CHANGES_TABLE = 'leaderboard_changes'
+
+
+class Leaderboard:
+    """
+    The top `size` rows of an ordered queryset, materialized into a small table named
+    leaderboard_<name>: a materialized view on PostgreSQL, a plain table elsewhere.
+
+        Leaderboard(
+            'top_publishers',
+            lambda: Publisher.objects.get_publishers_by_books_count(),
+            fields=['id', 'name', 'books_count'],
+            depends_on=[Publisher, Book],
+        )
+
+    Reads are a single SELECT of the materialized rows. Writes to the tables of the depends_on
+    models (and of their M2M relations) are logged by the triggers of a TrackLeaderboardChanges
+    migration, and refresh_leaderboards() (python -m orm_skeleton.leaderboards --every SECONDS)
+    rebuilds the leaderboards whose tables were written to. Missing leaderboards are built after migrate.
+    """
+
+    def __init__(self, name, queryset, fields, size=10, depends_on=()):
+        self.name = name
+        self.queryset = queryset
+        self.fields = list(fields)
+        self.size = size
+        self.depends_on = list(depends_on)
+        self.table = f'leaderboard_{name}'
+
+        LEADERBOARDS[name] = self
+
+    def get_tables(self):
+        tables = []
+
+        for model in self.depends_on:
+            tables.append(model._meta.db_table)
+            tables += [field.remote_field.through._meta.db_table for field in model._meta.local_many_to_many]
+
+        return list(dict.fromkeys(tables))
+
+    def get_ranked_queryset(self):
+        queryset = self.queryset()
+        order_by = [
+            F(name[1:]).desc() if name.startswith('-') else F(name).asc()
+            for name in queryset.query.order_by
+        ]
+
+        return queryset.annotate(
+            rank=Window(RowNumber(), order_by=order_by)
+        ).values(*self.fields, 'rank')[:self.size]
+
+
+class TrackLeaderboardChanges(Operation):
+    """
+    Creates the leaderboard_changes log and triggers that append to it on writes to tables.
+    On PostgreSQL every statement appends a row, so concurrent writers never update a shared row.
+    SQLite, which runs one writer at a time, keeps at most one pending row per table.
+    """
+
+    reversible = True
+    reduces_to_sql = False
+
+    def __init__(self, tables):
+        self.tables = list(tables)
+
+    def deconstruct(self):
+        return self.__class__.__name__, [], {'tables': self.tables}
+
+    def state_forwards(self, app_label, state):
+        pass
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        quote = connection.ops.quote_name
+        changes = quote(CHANGES_TABLE)
+
+        if connection.vendor == 'postgresql':
+            schema_editor.execute(
+                f"CREATE TABLE {changes} (id bigint GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY, "
+                f"table_name varchar(255) NOT NULL)"
+            )
+            schema_editor.execute(
+                f"CREATE OR REPLACE FUNCTION leaderboard_log_change() RETURNS trigger LANGUAGE plpgsql AS $$ "
+                f"BEGIN INSERT INTO {changes} (table_name) VALUES (TG_TABLE_NAME); RETURN NULL; END $$"
+            )
+
+            for table in self.tables:
+                schema_editor.execute(
+                    f"CREATE TRIGGER leaderboard_change AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE "
+                    f"ON {quote(table)} FOR EACH STATEMENT EXECUTE FUNCTION leaderboard_log_change()"
+                )
+            return
+
+        schema_editor.execute(
+            f"CREATE TABLE {changes} (id integer PRIMARY KEY AUTOINCREMENT, table_name varchar(255) NOT NULL)"
+        )
+        schema_editor.execute(f"CREATE INDEX {quote(CHANGES_TABLE + '_table_name')} ON {changes} (table_name)")
+
+        for table in self.tables:
+            table_name = "'{}'".format(table.replace("'", "''"))
+
+            # Rebuilding a table (e.g. SQLite's AlterField) drops its triggers, add them again after it
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                schema_editor.execute(
+                    f"CREATE TRIGGER {quote(f'leaderboard_change_{table}_{event.lower()}')} "
+                    f"AFTER {event} ON {quote(table)} BEGIN "
+                    f"INSERT INTO {changes} (table_name) SELECT {table_name} "
+                    f"WHERE NOT EXISTS (SELECT 1 FROM {changes} WHERE table_name = {table_name}); END"
+                )
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        connection = schema_editor.connection
+        quote = connection.ops.quote_name
+
+        for table in self.tables:
+            if connection.vendor == 'postgresql':
+                schema_editor.execute(f"DROP TRIGGER IF EXISTS leaderboard_change ON {quote(table)}")
+            else:
+                for event in ('insert', 'update', 'delete'):
+                    schema_editor.execute(f"DROP TRIGGER IF EXISTS {quote(f'leaderboard_change_{table}_{event}')}")
+
+        if connection.vendor == 'postgresql':
+            schema_editor.execute("DROP FUNCTION IF EXISTS leaderboard_log_change()")
+
+        schema_editor.execute(f"DROP TABLE IF EXISTS {quote(CHANGES_TABLE)}")
+
+    def describe(self):
+        return f"Log leaderboard changes of {', '.join(self.tables)}"
+
+
+def get_leaderboard(name):
+    try:
+        return LEADERBOARDS[name]
+    except KeyError:
+        raise LookupError(f"Leaderboard {name} is not declared.") from None
+
+
+def get_table_names(connection):
+    with connection.cursor() as cursor:
+        return set(connection.introspection.table_names(cursor, include_views=True))
+
+
+def refresh_leaderboard(name, using='default', rebuild=False):
+    """Recompute one leaderboard. rebuild=True recreates it, e.g. after its declaration changed."""
+    leaderboard = get_leaderboard(name)
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    table = quote(leaderboard.table)
+    sql, params = leaderboard.get_ranked_queryset().query.get_compiler(using).as_sql()
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        exists = not rebuild and leaderboard.table in get_table_names(connection)
+
+        if connection.vendor == 'postgresql':
+            if exists:
+                # Readers keep seeing the old rows while the new ones are computed
+                cursor.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {table}")
+            else:
+                cursor.execute(f"DROP MATERIALIZED VIEW IF EXISTS {table}")
+                cursor.execute(f"CREATE MATERIALIZED VIEW {table} AS {sql}", params)
+                cursor.execute(f"CREATE UNIQUE INDEX ON {table} (rank)")
+        elif exists:
+            cursor.execute(f"DELETE FROM {table}")
+            cursor.execute(f"INSERT INTO {table} {sql}", params)
+        else:
+            cursor.execute(f"DROP TABLE IF EXISTS {table}")
+            cursor.execute(f"CREATE TABLE {table} AS {sql}", params)
+            cursor.execute(f"CREATE UNIQUE INDEX {quote(leaderboard.table + '_rank')} ON {table} (rank)")
+
+
+def refresh_leaderboards(stale_only=True, using='default'):
+    """
+    Rebuild the leaderboards whose tables were written to since the last run (all of them with
+    stale_only=False) and consume the logged changes they were rebuilt from. Must not run inside
+    another transaction: on PostgreSQL it reads the log and the tables from one REPEATABLE READ
+    snapshot, so a change that commits meanwhile stays in the log for the next run.
+    """
+    connection = connections[using]
+    quote = connection.ops.quote_name
+    refreshed = []
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+
+        cursor.execute(f"SELECT id, table_name FROM {quote(CHANGES_TABLE)}")
+        changes = cursor.fetchall()
+        changed_tables = {table for _, table in changes}
+        existing = get_table_names(connection)
+
+        for name, leaderboard in LEADERBOARDS.items():
+            if not stale_only or leaderboard.table not in existing or changed_tables & set(leaderboard.get_tables()):
+                refresh_leaderboard(name, using)
+                refreshed.append(name)
+
+        ids = [change_id for change_id, _ in changes]
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor.execute(
+                f"DELETE FROM {quote(CHANGES_TABLE)} WHERE id IN ({', '.join(['%s'] * len(chunk))})", chunk,
+            )
+
+    return refreshed
+
+
+def build_missing_leaderboards(using='default', **kwargs):
+    """post_migrate receiver: materialize the declared leaderboards that do not exist yet."""
+    import_module('main_app.leaderboards')
+    existing = get_table_names(connections[using])
+
+    for name, leaderboard in LEADERBOARDS.items():
+        if leaderboard.table not in existing:
+            refresh_leaderboard(name, using)
+
+
+def read_leaderboard(name, k=None, using='default'):
+    """
+    The first k rows (all of them by default) in rank order, as objects with one attribute per field.
+    One SELECT of at most k materialized rows, the ranking is neither recomputed nor checked for staleness.
+    """
+    leaderboard = get_leaderboard(name)
+    connection = connections[using]
+    k = min(k or leaderboard.size, leaderboard.size)
+    columns = [*leaderboard.fields, 'rank']
+    quoted_columns = ', '.join(connection.ops.quote_name(column) for column in columns)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {quoted_columns} FROM {connection.ops.quote_name(leaderboard.table)} "
+            f"WHERE rank <= %s ORDER BY rank",
+            [k],
+        )
+        return [SimpleNamespace(**dict(zip(columns, row))) for row in cursor.fetchall()]
+
+
+if __name__ == '__main__':
+    # python -m orm_skeleton.leaderboards [--every SECONDS]
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
+    django.setup()
+    import_module('main_app.leaderboards')
+
+    interval = float(sys.argv[sys.argv.index('--every') + 1]) if '--every' in sys.argv else None
+
+    while True:
+        print(f"Refreshed: {', '.join(refresh_leaderboards()) or 'nothing'}")
+
+        if interval is None:
+            break
+
+        time.sleep(interval)
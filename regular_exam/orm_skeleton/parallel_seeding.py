@@ -0,0 +1,140 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import django
+from django.apps import apps
+from django.db import connections
+
+from orm_skeleton.counter_cache import reconcile_counter_caches
+from orm_skeleton.helpers import populate_model_in_batches
+
+
+def get_model_dependencies(models):
+    """Map every model to the models of the same set it points to through FK, OneToOne or M2M fields."""
+    models = set(models)
+    dependencies = {}
+
+    for model in models:
+        related = set()
+        for field in [*model._meta.fields, *model._meta.local_many_to_many]:
+            if field.is_relation and field.related_model in models and field.related_model is not model:
+                related.add(field.related_model)
+
+        dependencies[model] = related
+
+    return dependencies
+
+
+def get_seeding_order(models):
+    """Group the models into levels; every level only depends on the levels before it."""
+    dependencies = get_model_dependencies(models)
+    seeded = set()
+    levels = []
+
+    while len(seeded) < len(dependencies):
+        level = [model for model, parents in dependencies.items() if model not in seeded and parents <= seeded]
+
+        if not level:
+            cycle = ', '.join(model.__name__ for model in dependencies if model not in seeded)
+            raise ValueError(f"Cannot order models with circular dependencies: {cycle}")
+
+        levels.append(sorted(level, key=lambda model: model._meta.label))
+        seeded.update(level)
+
+    return levels
+
+
+def split_into_partitions(num_records, partitions):
+    partition_size = math.ceil(num_records / partitions)
+
+    return [
+        (start, min(partition_size, num_records - start))
+        for start in range(0, num_records, partition_size)
+    ]
+
+
+def has_unique_relations(model):
+    return any(field.is_relation and field.unique for field in model._meta.fields if not field.primary_key)
+
+
+def init_worker():
+    # With "spawn" the worker starts from scratch, with "fork" this is a no-op
+    django.setup()
+
+
+def seed_partition(model_label, first_index, num_records, batch_size):
+    model = apps.get_model(model_label)
+    populate_model_in_batches(model, num_records, batch_size, first_index=first_index, reconcile=False)
+    connections.close_all()
+
+    return model_label, num_records
+
+
+def seed_models_in_parallel(records_per_model, workers=None, batch_size=1000, min_partition_size=10_000):
+    """
+    Seed several models at once in a process pool, one database connection per worker.
+    records_per_model maps a model to its row count. Models that do not depend on each other
+    load concurrently, a dependent model starts as soon as all of its parents are finished.
+    """
+    dependencies = get_model_dependencies(records_per_model)
+    get_seeding_order(records_per_model)  # fail fast on cycles
+
+    # Forked workers must not share the parent's open connections
+    connections.close_all()
+
+    finished = set()
+    submitted = set()
+    pending_partitions = {}
+
+    max_partitions = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        running = set()
+
+        def submit_ready_models():
+            ready = [
+                model for model, parents in dependencies.items()
+                if model not in submitted and parents <= finished
+            ]
+
+            for model in ready:
+                # A recursive call below may have scheduled it already
+                if model in submitted:
+                    continue
+
+                num_records = records_per_model[model]
+                partitions = max(1, min(max_partitions, num_records // min_partition_size))
+
+                # Unique relations are drawn without replacement, which cannot be split across processes
+                if has_unique_relations(model):
+                    partitions = 1
+
+                submitted.add(model)
+                chunks = split_into_partitions(num_records, partitions) if num_records else []
+                pending_partitions[model._meta.label] = len(chunks)
+
+                for first_index, size in chunks:
+                    running.add(executor.submit(seed_partition, model._meta.label, first_index, size, batch_size))
+
+                # Nothing to insert, so its dependents can be scheduled right away
+                if not chunks:
+                    finished.add(model)
+                    submit_ready_models()
+
+        submit_ready_models()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                running.discard(future)
+                model_label, num_records = future.result()
+                pending_partitions[model_label] -= 1
+
+                if not pending_partitions[model_label]:
+                    finished.add(apps.get_model(model_label))
+
+            submit_ready_models()
+
+    # Workers bulk insert without signals, so counter caches are recounted once at the end
+    reconcile_counter_caches()
@@ -10,6 +10,8 @@ django.setup()
 # Import your models here
 from django.db.models import Q, Count, Sum, F, Avg
 from main_app.models import Astronaut, Mission, Spacecraft
+from main_app.leaderboards import top_commanders
+from orm_skeleton.leaderboards import read_leaderboard
 
 
 # Create queries within functions
@@ -33,23 +35,22 @@ def get_astronauts(search_string=None) -> str:
         for a in astronauts
     )
 
-def get_top_astronaut() -> str:
-    astronaut = Astronaut.objects.get_astronauts_by_missions_count().first()
+def get_top_astronaut(from_leaderboard=False) -> str:
+    if from_leaderboard:
+        astronaut = next(iter(read_leaderboard('top_astronauts', 1)), None)
+    else:
+        astronaut = Astronaut.objects.get_astronauts_by_missions_count().first()
 
     if not astronaut or astronaut.missions_count == 0:
         return 'No data.'
 
     return f'Top Astronaut: {astronaut.name} with {astronaut.missions_count} missions.'
 
-def get_top_commander() -> str:
-    commander = Astronaut.objects.annotate(
-        commanded_missions_count=Count(
-            'commanded_missions'
-        )
-    ).order_by(
-            '-commanded_missions_count',
-            'phone_number'
-        ).first()
+def get_top_commander(from_leaderboard=False) -> str:
+    if from_leaderboard:
+        commander = next(iter(read_leaderboard('top_commanders', 1)), None)
+    else:
+        commander = top_commanders().first()
 
     if commander and commander.commanded_missions_count > 0:
         return f'Top Commander: {commander.name} with {commander.commanded_missions_count} commanded missions.'
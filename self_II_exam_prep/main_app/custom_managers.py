@@ -1,13 +1,12 @@
 from django.db import models
 
+from orm_skeleton.trigram_search import SearchableQuerySet
 
-class AstronautManager(models.Manager):
+
+class AstronautManager(models.Manager.from_queryset(SearchableQuerySet)):
     def get_astronauts_by_missions_count(self):
-        return self.annotate(
-            missions_count=models.Count(
-                'missions'
-            )
-        ).order_by(
+        # missions_count is a counter cache column, no join and aggregate needed
+        return self.order_by(
             '-missions_count',
             'phone_number'
         )
\ No newline at end of file
@@ -0,0 +1,21 @@
+from orm_skeleton.scale_factor import Zipf, LongTail, Bursty
+from main_app.models import Astronaut, Spacecraft, Mission
+
+
+# Benchmark dataset for get_top_astronaut, get_top_commander, get_last_completed_mission, get_most_used_spacecraft
+DATASET_SPEC = {
+    'seed': 20251128,
+    'models': [
+        (Astronaut, {'share': 0.15}),
+        (Spacecraft, {'share': 0.02}),
+        (Mission, {
+            'share': 0.83,
+            'profiles': {
+                'spacecraft': Zipf(1.3),
+                'commander': Zipf(1.1),
+                'astronauts': LongTail(1.5),
+                'launch_date': Bursty(bursts=40),
+            },
+        }),
+    ],
+}
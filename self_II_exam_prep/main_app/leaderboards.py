@@ -0,0 +1,30 @@
+from django.db.models import Count
+
+from main_app.models import Astronaut, Mission
+from orm_skeleton.leaderboards import Leaderboard
+
+
+def top_commanders():
+    return Astronaut.objects.annotate(
+        commanded_missions_count=Count(
+            'commanded_missions'
+        )
+    ).order_by(
+        '-commanded_missions_count',
+        'phone_number'
+    )
+
+
+Leaderboard(
+    'top_astronauts',
+    lambda: Astronaut.objects.get_astronauts_by_missions_count(),
+    fields=['id', 'name', 'missions_count'],
+    depends_on=[Astronaut, Mission],
+)
+
+Leaderboard(
+    'top_commanders',
+    top_commanders,
+    fields=['id', 'name', 'commanded_missions_count'],
+    depends_on=[Astronaut, Mission],
+)
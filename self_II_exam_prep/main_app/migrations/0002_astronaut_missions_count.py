@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+from orm_skeleton.counter_cache import reconcile_counter
+
+
+def count_missions(apps, schema_editor):
+    reconcile_counter(apps.get_model('main_app', 'Astronaut'), 'missions_count', apps.get_model('main_app', 'Mission'), 'astronauts', using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='astronaut',
+            name='missions_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.RunPython(count_missions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+from orm_skeleton.leaderboards import TrackLeaderboardChanges
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('main_app', '0003_trigram_search_indexes'),
+    ]
+
+    operations = [
+        TrackLeaderboardChanges(
+            tables=['main_app_astronaut', 'main_app_mission', 'main_app_mission_astronauts'],
+        ),
+    ]
@@ -2,6 +2,8 @@ from django.core.validators import MinLengthValidator, RegexValidator, MinValueV
 from django.db import models
 
 from main_app.custom_managers import AstronautManager
+from orm_skeleton.counter_cache import CounterCacheField
+from orm_skeleton.trigram_search import trigram_indexes
 
 
 # Create your models here.
@@ -36,9 +38,16 @@ class Astronaut(models.Model):
     updated_at = models.DateTimeField(
         auto_now=True
     )
+    missions_count = CounterCacheField(
+        'Mission',
+        'astronauts'
+    )
 
     objects = AstronautManager()
 
+    class Meta:
+        indexes = trigram_indexes('astronaut', ['name', 'phone_number'])
+
 class Spacecraft(models.Model):
     name = models.CharField(
         max_length=120,
@@ -0,0 +1,8 @@
+# Maximum number of queries per report function in caller.py, independent of the row count
+QUERY_BUDGETS = {
+    'get_astronauts': {'queries': 1, 'args': ('Astronaut 1',)},
+    'get_top_astronaut': {'queries': 1},
+    'get_top_commander': {'queries': 1},
+    'get_last_completed_mission': {'queries': 4},
+    'get_most_used_spacecraft': {'queries': 1},
+}
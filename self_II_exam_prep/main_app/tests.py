@@ -1,3 +1,15 @@
+from importlib import import_module
+
 from django.test import TestCase
 
-# Create your tests here.
+from main_app.dataset_spec import DATASET_SPEC
+from main_app.query_budgets import QUERY_BUDGETS
+from orm_skeleton.query_budget import check_query_budgets
+
+
+class QueryBudgetTests(TestCase):
+    # Small scale factors keep the run short, the budgets do not depend on the row count anyway
+    scale_factors = (0.02, 0.1)
+
+    def test_report_functions_stay_within_query_budgets(self):
+        check_query_budgets(import_module('caller'), QUERY_BUDGETS, DATASET_SPEC, self.scale_factors)
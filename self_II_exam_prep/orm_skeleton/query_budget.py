@@ -0,0 +1,108 @@
+import os
+import sys
+import time
+from importlib import import_module
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from orm_skeleton.scale_factor import generate_dataset
+
+DEFAULT_SCALE_FACTORS = (0.1, 1)
+
+
+def measure(function, args=(), kwargs=None):
+    with CaptureQueriesContext(connection) as context:
+        started = time.perf_counter()
+        function(*args, **(kwargs or {}))
+        elapsed = time.perf_counter() - started
+
+    sql_time = sum(float(query['time']) for query in context.captured_queries)
+
+    return {
+        'queries': len(context.captured_queries),
+        'sql_time': sql_time,
+        'python_time': max(elapsed - sql_time, 0.0),
+    }
+
+
+def run_query_budgets(caller, budgets, dataset_spec, scale_factors=DEFAULT_SCALE_FACTORS):
+    """
+    Seed the dataset at every scale factor and run each report function under CaptureQueriesContext.
+    budgets maps a function name to {'queries': max queries, 'args': (...), 'kwargs': {...}}.
+    A budget is a constant: the same function must stay within it whatever the row count.
+    Every scale factor is seeded inside a transaction that is rolled back afterwards.
+    """
+    results = []
+
+    for scale_factor in scale_factors:
+        with transaction.atomic():
+            generate_dataset(dataset_spec, scale_factor)
+
+            for name, budget in budgets.items():
+                result = measure(getattr(caller, name), budget.get('args', ()), budget.get('kwargs'))
+                result.update(function=name, scale_factor=scale_factor, budget=budget['queries'])
+                results.append(result)
+
+            transaction.set_rollback(True)
+
+    return results
+
+
+def find_violations(results):
+    violations = [
+        f"{r['function']} ran {r['queries']} queries at SF{r['scale_factor']}, budget is {r['budget']}"
+        for r in results if r['queries'] > r['budget']
+    ]
+
+    # The query count must not grow with the data, even while it is under budget
+    counts = {}
+    for r in results:
+        counts.setdefault(r['function'], set()).add(r['queries'])
+
+    violations.extend(
+        f"{name} query count depends on the row count: {sorted(values)}"
+        for name, values in counts.items() if len(values) > 1
+    )
+
+    return violations
+
+
+def format_report(results):
+    header = f"{'function':<32} {'SF':>6} {'queries':>8} {'budget':>7} {'SQL ms':>9} {'Python ms':>10}"
+    lines = [header, '-' * len(header)]
+
+    for r in results:
+        lines.append(
+            f"{r['function']:<32} {r['scale_factor']:>6} {r['queries']:>8} {r['budget']:>7} "
+            f"{r['sql_time'] * 1000:>9.1f} {r['python_time'] * 1000:>10.1f}"
+        )
+
+    return '\n'.join(lines)
+
+
+def check_query_budgets(caller, budgets, dataset_spec, scale_factors=DEFAULT_SCALE_FACTORS):
+    results = run_query_budgets(caller, budgets, dataset_spec, scale_factors)
+    print(format_report(results))
+
+    violations = find_violations(results)
+    if violations:
+        raise AssertionError('Query budget exceeded:\n' + '\n'.join(violations))
+
+    return results
+
+
+if __name__ == '__main__':
+    # python -m orm_skeleton.query_budget [scale factor ...] against the configured database,
+    # python manage.py test main_app runs the same check against a test database
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
+    django.setup()
+
+    check_query_budgets(
+        import_module('caller'),
+        import_module('main_app.query_budgets').QUERY_BUDGETS,
+        import_module('main_app.dataset_spec').DATASET_SPEC,
+        [float(value) for value in sys.argv[1:]] or DEFAULT_SCALE_FACTORS,
+    )
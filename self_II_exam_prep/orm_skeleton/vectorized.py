@@ -0,0 +1,301 @@
+from datetime import timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import AutoField, PositiveIntegerField, BooleanField, CharField, TextField, EmailField, \
+    DecimalField, DateField, IntegerField, PositiveSmallIntegerField, PositiveBigIntegerField, DateTimeField, \
+    FloatField
+from django.db.models.fields import AutoFieldMixin
+from django.db.models.fields.related import ForeignKey, OneToOneField
+
+from orm_skeleton.counter_cache import reconcile_loaded_models
+from orm_skeleton.helpers import build_related_key_pools, find_field_strategy, lookup_by_field_class, \
+    get_validator_bounds, get_loaded_models, EPOCH_START, EPOCH_END
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def choice_column(field, model):
+    values = np.array([choice[0] for choice in field.flatchoices], dtype=object)
+    return lambda rng, start, size, pools: values[rng.integers(0, len(values), size)].tolist()
+
+
+def positive_integer_column(field, model):
+    return lambda rng, start, size, pools: rng.integers(1, 101, size).tolist()
+
+
+def integer_column(field, model):
+    return lambda rng, start, size, pools: rng.integers(-100, 101, size).tolist()
+
+
+def float_column(field, model):
+    low, high = get_validator_bounds(field, 0.0, 100.0)
+    return lambda rng, start, size, pools: rng.uniform(low, high, size).round(2).tolist()
+
+
+def boolean_column(field, model):
+    return lambda rng, start, size, pools: rng.integers(0, 2, size).astype(bool).tolist()
+
+
+def text_column(field, model):
+    prefix = model.__name__
+    return lambda rng, start, size, pools: [f"{prefix} {index + 1}" for index in range(start, start + size)]
+
+
+def email_column(field, model):
+    values = np.array(['user@example.com', 'admin@example.com', 'customer@example.com'], dtype=object)
+    return lambda rng, start, size, pools: values[rng.integers(0, len(values), size)].tolist()
+
+
+def decimal_column(field, model):
+    # Draw scaled integers (e.g. cents) and shift the decimal point, no float rounding involved
+    decimal_places = field.decimal_places
+    low = 10 ** decimal_places
+    high = 10 ** field.max_digits
+
+    def generate(rng, start, size, pools):
+        return [Decimal(value).scaleb(-decimal_places) for value in rng.integers(low, high, size).tolist()]
+
+    return generate
+
+
+def date_column(field, model):
+    start_date = np.datetime64(EPOCH_START.date(), 'D')
+    days_range = (EPOCH_END - EPOCH_START).days
+    return lambda rng, start, size, pools: (start_date + rng.integers(0, days_range + 1, size)).tolist()
+
+
+def datetime_column(field, model):
+    start_date = np.datetime64(EPOCH_START, 's')
+    seconds_range = int((EPOCH_END - EPOCH_START).total_seconds())
+    is_aware = isinstance(field, DateTimeField) and settings.USE_TZ
+
+    def generate(rng, start, size, pools):
+        values = (start_date + rng.integers(0, seconds_range + 1, size)).tolist()
+        return [value.replace(tzinfo=timezone.utc) for value in values] if is_aware else values
+
+    return generate
+
+
+def related_key_column(field, model):
+    def generate(rng, start, size, pools):
+        keys = pools[field.name].take(rng, size)
+
+        if len(keys) < size:
+            if not field.null:
+                raise ValueError(
+                    f"Cannot populate {model.__name__}.{field.name}: "
+                    f"not enough {field.related_model.__name__} rows."
+                )
+            keys = keys + [None] * (size - len(keys))
+
+        return keys
+
+    return generate
+
+
+def student_id_column(field, model):
+    return lambda rng, start, size, pools: list(range(start + 1, start + size + 1))
+
+
+def credit_card_column(field, model):
+    return lambda rng, start, size, pools: [f'{value:016d}' for value in rng.integers(0, 10 ** 16, size).tolist()]
+
+
+def skip_column(field, model):
+    return None
+
+
+# Same lookup rules as FIELD_STRATEGIES in helpers: most specific class along the MRO wins
+COLUMN_STRATEGIES = {
+    AutoFieldMixin: skip_column,
+    PositiveIntegerField: positive_integer_column,
+    PositiveSmallIntegerField: positive_integer_column,
+    PositiveBigIntegerField: positive_integer_column,
+    IntegerField: integer_column,
+    FloatField: float_column,
+    BooleanField: boolean_column,
+    CharField: text_column,
+    TextField: text_column,
+    EmailField: email_column,
+    DecimalField: decimal_column,
+    DateField: date_column,
+    DateTimeField: datetime_column,
+    ForeignKey: related_key_column,
+    OneToOneField: related_key_column,
+    'StudentIDField': student_id_column,
+    'MaskedCreditCardField': credit_card_column,
+    'UnixTimeStampField': datetime_column,
+    'SearchVectorField': skip_column,
+    'CounterCacheField': skip_column,
+}
+
+_column_plans = {}
+
+
+def register_column_strategy(field_class, strategy):
+    """
+    Register a column strategy for a field class (or class name). A strategy receives the field and the model
+    and returns a callable(rng, start, size, pools) producing a whole column, or None to skip the field.
+    """
+    COLUMN_STRATEGIES[field_class] = strategy
+    _column_plans.clear()
+
+
+def row_strategy_column(generator):
+    # Fields with only a per-row strategy registered are still generated one value at a time
+    return lambda rng, start, size, pools: [generator(index, pools) for index in range(start, start + size)]
+
+
+def get_column_plan(model):
+    plan = _column_plans.get(model)
+
+    if plan is None:
+        plan = []
+        for field in model._meta.fields:
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                continue
+
+            if field.choices and not isinstance(field, AutoField):
+                generator = choice_column(field, model)
+            else:
+                strategy = lookup_by_field_class(field, COLUMN_STRATEGIES)
+
+                if strategy:
+                    generator = strategy(field, model)
+                else:
+                    row_strategy = find_field_strategy(field)
+                    row_generator = row_strategy(field, model) if row_strategy else None
+                    generator = row_strategy_column(row_generator) if row_generator else None
+
+            if generator is not None:
+                plan.append((field.attname, generator))
+
+        _column_plans[model] = plan
+
+    return plan
+
+
+class KeyColumnPool:
+    """
+    NumPy view over a RelatedKeyPool. Keys are sorted first, so draws from a seeded Generator
+    do not depend on the order in which the database returned them.
+    """
+
+    def __init__(self, pool, rng):
+        self.unique = pool.unique
+        self.keys = np.sort(np.asarray(pool.keys))
+        # Optional draw probabilities, one per key (see scale_factor profiles)
+        self.weights = None
+
+        if self.unique:
+            self.keys = rng.permutation(self.keys)
+            self.position = 0
+
+    def __len__(self):
+        return len(self.keys)
+
+    def take(self, rng, size):
+        if not len(self.keys):
+            return []
+
+        if self.unique:
+            taken = self.keys[self.position:self.position + size]
+            self.position += len(taken)
+            return taken.tolist()
+
+        if self.weights is not None:
+            return self.keys[rng.choice(len(self.keys), size, p=self.weights)].tolist()
+
+        return self.keys[rng.integers(0, len(self.keys), size)].tolist()
+
+
+def generate_rows(model, rng, start, size, pools, overrides=None):
+    plan = get_column_plan(model)
+
+    if overrides:
+        plan = [(attname, overrides.get(attname, generator)) for attname, generator in plan]
+
+    names = [attname for attname, generator in plan]
+    columns = [generator(rng, start, size, pools) for attname, generator in plan]
+
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def link_many_to_many_vectorized(model, instances, pools, rng, batch_size):
+    for field in model._meta.local_many_to_many:
+        through = field.remote_field.through
+        pool = pools[field.name]
+
+        if not through._meta.auto_created or not len(pool):
+            continue
+
+        # Between one and five links per row; duplicate pairs are dropped by ignore_conflicts
+        source_pks = np.repeat([instance.pk for instance in instances], rng.integers(1, 6, len(instances)))
+        target_pks = pool.take(rng, len(source_pks))
+        source_column = f'{field.m2m_field_name()}_id'
+        target_column = f'{field.m2m_reverse_field_name()}_id'
+
+        through.objects.bulk_create(
+            [through(**{source_column: source, target_column: target})
+             for source, target in zip(source_pks.tolist(), target_pks)],
+            batch_size=batch_size,
+            ignore_conflicts=True
+        )
+
+
+def profile_column(field, profile):
+    return lambda rng, start, size, pools: profile.column(field, rng, size)
+
+
+def apply_profiles(model, profiles, pools, rng):
+    """
+    Relation profiles skew which related keys are drawn, value profiles replace a field's column generator.
+    Returns the column overrides keyed by attname.
+    """
+    overrides = {}
+
+    for name, profile in profiles.items():
+        field = model._meta.get_field(name)
+
+        if field.is_relation:
+            pool = pools[name]
+            if not pool.unique and len(pool):
+                pool.weights = profile.weights(len(pool), rng)
+        else:
+            overrides[field.attname] = profile_column(field, profile)
+
+    return overrides
+
+
+def populate_model_vectorized(model, num_records=10, batch_size=10_000, seed=None, profiles=None, reconcile=True):
+    """
+    Column-at-a-time counterpart of populate_model_with_data. The same seed and the same
+    related tables always produce the same dataset. reconcile=False leaves recounting the
+    counter caches to the caller.
+    """
+    if np is None:
+        raise ImportError("populate_model_vectorized requires numpy (pip install numpy).")
+
+    rng = np.random.default_rng(seed)
+    pools = {
+        name: KeyColumnPool(pool, rng)
+        for name, pool in build_related_key_pools(model).items()
+    }
+    overrides = apply_profiles(model, profiles or {}, pools, rng)
+
+    for start in range(0, num_records, batch_size):
+        size = min(batch_size, num_records - start)
+        instances = [model(**values) for values in generate_rows(model, rng, start, size, pools, overrides)]
+
+        with transaction.atomic():
+            created = model.objects.bulk_create(instances, batch_size=batch_size)
+            link_many_to_many_vectorized(model, created, pools, rng, batch_size)
+
+    # bulk_create() sends no signals, so the counter caches are recounted once at the end
+    if num_records and reconcile:
+        reconcile_loaded_models(get_loaded_models(model))
@@ -14,6 +14,9 @@ from main_app.models import House, Dragon, Quest
 # Create queries within functions
 
 def get_houses(search_string=None) -> str:
+    if not search_string:
+        return "No houses match your search."
+
     houses = House.objects.filter(
         Q(name__istartswith=search_string)
             |
@@ -23,26 +26,27 @@ def get_houses(search_string=None) -> str:
         'name'
     )
 
-    if not houses or not search_string:
+    if not houses:
         return "No houses match your search."
 
-    if not houses.motto:
-        houses.motto = 'N/A'
-
-    return '\n'.join(f'House: {houses.name}, wins: {houses.wins}, motto: {houses.motto}')
+    return '\n'.join(f'House: {h.name}, wins: {h.wins}, motto: {h.motto or "N/A"}' for h in houses)
 
 def get_most_dangerous_house() -> str:
     most_dangerous_house = House.objects.get_houses_by_dragons_count().first()
 
-    if not most_dangerous_house or not most_dangerous_house.dragon_count:
+    if not most_dangerous_house or not most_dangerous_house.dragons_count:
         return "No relevant data."
 
     return f"The most dangerous house is the House of {most_dangerous_house.name} \
-            with {most_dangerous_house.dragon_count} dragons. \
+            with {most_dangerous_house.dragons_count} dragons. \
             Currently {'' if most_dangerous_house.is_ruling else 'not '}ruling the kingdom."
 
 def get_most_powerful_dragon() -> str:
-    powerful_dragon = Dragon.objects.filter(
+    powerful_dragon = Dragon.objects.select_related(
+        'house'
+    ).annotate(
+        quests_count=Count('quests')
+    ).filter(
         is_healthy=True,
         power__lte=10.0
     ).order_by(
@@ -57,7 +61,7 @@ def get_most_powerful_dragon() -> str:
             with a power level of {powerful_dragon.power:.1f}, \
             breath type {powerful_dragon.breath}, and {powerful_dragon.wins} wins, \
             coming from the house of {powerful_dragon.house.name}. \
-            Currently participating in {powerful_dragon.quests.count()} quests."
+            Currently participating in {powerful_dragon.quests_count} quests."
 
 
 def update_dragons_data() -> str:
@@ -1,7 +1,7 @@
 from django.db import models
-from django.db.models import Count
 
 
 class HouseManager(models.Manager):
     def get_houses_by_dragons_count(self):
-        return self.annotate(dragon_count=Count('dragons')).order_by('-dragon_count', 'name')
\ No newline at end of file
+        # dragons_count is a counter cache column, no join and aggregate needed
+        return self.order_by('-dragons_count', 'name')
\ No newline at end of file
@@ -0,0 +1,25 @@
+from orm_skeleton.scale_factor import Zipf, LongTail, Bursty
+from main_app.models import House, Dragon, Quest
+
+
+# Benchmark dataset for get_most_dangerous_house, get_most_powerful_dragon, get_earliest_quest
+DATASET_SPEC = {
+    'seed': 20251127,
+    'models': [
+        (House, {'share': 0.05}),
+        (Dragon, {
+            'share': 0.65,
+            'profiles': {
+                'house': Zipf(1.2),
+            },
+        }),
+        (Quest, {
+            'share': 0.30,
+            'profiles': {
+                'host': Zipf(1.1),
+                'dragons': LongTail(1.5),
+                'start_time': Bursty(bursts=20),
+            },
+        }),
+    ],
+}
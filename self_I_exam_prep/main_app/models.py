@@ -2,6 +2,7 @@ from django.core.validators import MinLengthValidator, MinValueValidator, MaxVal
 from django.db import models
 
 from main_app.custom_managers import HouseManager
+from orm_skeleton.counter_cache import CounterCacheField
 
 
 # Create your models here.
@@ -31,6 +32,10 @@ class House(models.Model):
     modified_at = models.DateTimeField(
         auto_now=True
     )
+    dragons_count = CounterCacheField(
+        'Dragon',
+        'house'
+    )
 
     objects = HouseManager()
 
@@ -0,0 +1,7 @@
+# Maximum number of queries per report function in caller.py, independent of the row count
+QUERY_BUDGETS = {
+    'get_houses': {'queries': 1, 'args': ('House',)},
+    'get_most_dangerous_house': {'queries': 1},
+    'get_most_powerful_dragon': {'queries': 1},
+    'get_earliest_quest': {'queries': 4},
+}
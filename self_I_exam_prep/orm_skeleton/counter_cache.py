@@ -0,0 +1,208 @@
+import os
+
+from django.db import models
+from django.db.models import DEFERRED, Count, F, OuterRef, Subquery, Value
+from django.db.models.fields.related import lazy_related_operation
+from django.db.models.functions import Coalesce
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+
+# Every (counter field, related field) pair, used by reconcile_counter_caches()
+COUNTER_CACHES = []
+
+
+class CounterCacheField(models.PositiveIntegerField):
+    """
+    An indexed column holding the number of related rows, kept up to date with F() updates.
+
+        class Publisher(models.Model):
+            books_count = CounterCacheField('Book', 'publisher')
+
+    related_model and related_field name the ForeignKey or ManyToManyField pointing at this model.
+    save(), delete() and m2m add/remove/clear are tracked; bulk_create(), QuerySet.update() and raw
+    loads are not, run reconcile_counter_caches() after them. The seeding helpers and load_rows do.
+    """
+
+    def __init__(self, related_model=None, related_field=None, *args, **kwargs):
+        self.related_model_name = related_model
+        self.related_field_name = related_field
+        kwargs.setdefault('default', 0)
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('db_index', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        # Migrations only see a plain indexed integer column
+        name, path, args, kwargs = super().deconstruct()
+        return name, 'django.db.models.PositiveIntegerField', args, kwargs
+
+    def contribute_to_class(self, cls, name, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+
+        if not cls._meta.abstract and self.related_model_name:
+            lazy_related_operation(self.connect_signals, cls, self.related_model_name)
+
+    def connect_signals(self, model, related_model):
+        related_field = related_model._meta.get_field(self.related_field_name)
+        COUNTER_CACHES.append((self, related_field))
+
+        if related_field.many_to_many:
+            connect_many_to_many(self, related_field)
+        else:
+            connect_foreign_key(self, related_field)
+
+
+def change_counter(field, pks, amount, using):
+    pks = [pk for pk in pks if pk is not None]
+
+    if pks and amount:
+        field.model._base_manager.using(using).filter(pk__in=pks).update(**{field.attname: F(field.attname) + amount})
+
+
+def connect_foreign_key(counter_field, related_field):
+    attname = related_field.attname
+    uid = f'counter_cache_{counter_field.model._meta.label}_{counter_field.name}'
+
+    def load_saved_value(sender, instance, raw=False, using=None, update_fields=None, **kwargs):
+        # One primary key lookup per update, so a stale or refreshed instance cannot skew the counters
+        instance._counter_cache_saved = None
+
+        if raw or instance._state.adding or instance.pk is None:
+            return
+
+        if update_fields is not None and not {attname, related_field.name} & set(update_fields):
+            instance._counter_cache_saved = DEFERRED
+            return
+
+        instance._counter_cache_saved = sender._base_manager.using(using).filter(
+            pk=instance.pk
+        ).values_list(attname, flat=True).first()
+
+    def update_on_save(sender, instance, created, raw=False, using=None, **kwargs):
+        saved = instance.__dict__.pop('_counter_cache_saved', None)
+        current = getattr(instance, attname)
+
+        if raw or saved is DEFERRED or saved == current:
+            return
+
+        change_counter(counter_field, [saved], -1, using)
+        change_counter(counter_field, [current], 1, using)
+
+    def update_on_delete(sender, instance, using=None, **kwargs):
+        change_counter(counter_field, [getattr(instance, attname)], -1, using)
+
+    model = related_field.model
+    pre_save.connect(load_saved_value, sender=model, weak=False, dispatch_uid=uid)
+    post_save.connect(update_on_save, sender=model, weak=False, dispatch_uid=uid)
+    post_delete.connect(update_on_delete, sender=model, weak=False, dispatch_uid=uid)
+
+
+def connect_many_to_many(counter_field, related_field):
+    # The through model may not be resolved yet when the counter field is connected
+    lazy_related_operation(
+        lambda model, through: connect_through_model(counter_field, related_field, through),
+        related_field.model,
+        related_field.remote_field.through,
+    )
+
+
+def connect_through_model(counter_field, related_field, through):
+    uid = f'counter_cache_{counter_field.model._meta.label}_{counter_field.name}'
+
+    def get_linked_pks(instance, reverse, using, pk_set=None):
+        # Rows that are really linked, remove() and clear() report what was asked for instead
+        source_name, target_name = related_field.m2m_field_name(), related_field.m2m_reverse_field_name()
+        if reverse:
+            source_name, target_name = target_name, source_name
+
+        links = through._base_manager.using(using).filter(**{source_name: instance.pk})
+        if pk_set is not None:
+            links = links.filter(**{f'{target_name}__in': pk_set})
+        return list(links.values_list(f'{target_name}_id', flat=True))
+
+    def update_on_change(sender, instance, action, reverse, pk_set, using=None, **kwargs):
+        # Forward: instance holds the relation and pk_set are counted rows. Reverse: the other way round.
+        if action in ('pre_remove', 'pre_clear'):
+            instance._counter_cache_removed = get_linked_pks(instance, reverse, using, pk_set)
+            return
+
+        if action == 'post_add':
+            changed, amount = pk_set, 1
+        elif action in ('post_remove', 'post_clear'):
+            changed, amount = instance.__dict__.pop('_counter_cache_removed', []), -1
+        else:
+            return
+
+        if reverse:
+            change_counter(counter_field, [instance.pk], amount * len(changed), using)
+        else:
+            change_counter(counter_field, changed, amount, using)
+
+    def update_on_delete(sender, instance, using=None, **kwargs):
+        # Deleting a row removes its links without m2m_changed
+        change_counter(counter_field, get_linked_pks(instance, False, using), -1, using)
+
+    m2m_changed.connect(update_on_change, sender=through, weak=False, dispatch_uid=uid)
+    pre_delete.connect(update_on_delete, sender=related_field.model, weak=False, dispatch_uid=uid)
+
+
+def count_related(related_field):
+    related_model = related_field.model
+
+    counts = related_model._base_manager.filter(
+        **{related_field.name: OuterRef('pk')}
+    ).order_by().values(
+        related_field.name
+    ).annotate(
+        total=Count('pk')
+    ).values('total')
+
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def reconcile_counter(model, counter_name, related_model, related_field_name, using='default'):
+    """Recount one counter column in a single UPDATE, also usable with historical models in migrations."""
+    related_field = related_model._meta.get_field(related_field_name)
+    return model._base_manager.using(using).update(**{counter_name: count_related(related_field)})
+
+
+def reconcile_counter_caches(models=None, using='default'):
+    """Recount every counter cache (or only those on the given models) from the related tables."""
+    reconciled = {}
+
+    for counter_field, related_field in COUNTER_CACHES:
+        if models is None or counter_field.model in models:
+            reconciled[f'{counter_field.model._meta.label}.{counter_field.name}'] = reconcile_counter(
+                counter_field.model, counter_field.name, related_field.model, related_field.name, using,
+            )
+
+    return reconciled
+
+
+def reconcile_loaded_models(loaded_models, using='default'):
+    """
+    Recount the counter caches that rows bulk loaded into loaded_models, without signals, may have
+    left stale: counters on those models and counters of the relations stored in them.
+    """
+    loaded_models = set(loaded_models)
+    reconciled = {}
+
+    for counter_field, related_field in COUNTER_CACHES:
+        through = getattr(related_field.remote_field, 'through', None)
+
+        if loaded_models & {counter_field.model, related_field.model, through}:
+            reconciled[f'{counter_field.model._meta.label}.{counter_field.name}'] = reconcile_counter(
+                counter_field.model, counter_field.name, related_field.model, related_field.name, using,
+            )
+
+    return reconciled
+
+
+if __name__ == '__main__':
+    # python -m orm_skeleton.counter_cache
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
+    django.setup()
+
+    for label, rows in reconcile_counter_caches().items():
+        print(f'{label}: {rows} rows reconciled')
@@ -0,0 +1,467 @@
+import queue
+import random
+import sys
+import threading
+from _decimal import Decimal
+from array import array
+
+from django.conf import settings
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.db import transaction
+from django.db.models import AutoField, PositiveIntegerField, BooleanField, CharField, TextField, EmailField, \
+    DecimalField, DateField, IntegerField, PositiveSmallIntegerField, PositiveBigIntegerField, DateTimeField, \
+    FloatField, Max
+from django.db.models.fields import AutoFieldMixin
+from django.db.models.fields.related import ForeignKey, OneToOneField, ManyToManyField
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from orm_skeleton.counter_cache import reconcile_loaded_models
+from orm_skeleton.fast_loader import load_rows
+
+# Generated dates fall in a fixed window, so a seed gives the same rows whatever day it runs
+EPOCH_START = datetime(2000, 1, 1)
+EPOCH_END = datetime(2025, 1, 1)
+
+
+class RelatedKeyPool:
+    """
+    Keys of a related table loaded once into a compact array and drawn from in Python,
+    instead of running ORDER BY RANDOM() against the related table for every generated row.
+    Tables larger than max_keys are reservoir-sampled while streaming them in chunks.
+    """
+
+    def __init__(self, queryset, key_field='pk', unique=False, max_keys=1_000_000, chunk_size=10_000):
+        self.unique = unique
+        self.keys = self._load(queryset, key_field, max_keys, chunk_size)
+
+        if unique:
+            random.shuffle(self.keys)
+
+    @staticmethod
+    def _load(queryset, key_field, max_keys, chunk_size):
+        key_model_field = queryset.model._meta.get_field(key_field) if key_field != 'pk' else queryset.model._meta.pk
+        keys = array('q') if isinstance(key_model_field, IntegerField) else []
+
+        # Reservoir sampling (algorithm R) keeps a uniform sample of at most max_keys keys
+        rows = queryset.order_by().values_list(key_field, flat=True).iterator(chunk_size=chunk_size)
+        for seen, key in enumerate(rows):
+            if seen < max_keys:
+                keys.append(key)
+            else:
+                slot = random.randint(0, seen)
+                if slot < max_keys:
+                    keys[slot] = key
+
+        return keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def draw(self):
+        if not self.keys:
+            return None
+
+        if self.unique:
+            # Draw without replacement, the keys were shuffled once on load
+            return self.keys.pop()
+
+        return self.keys[random.randrange(len(self.keys))]
+
+    def sample(self, k):
+        return random.sample(self.keys, min(k, len(self.keys)))
+
+
+def build_related_key_pools(model):
+    pools = {}
+
+    for field in model._meta.fields:
+        if not (isinstance(field, ForeignKey) or isinstance(field, OneToOneField)):
+            continue
+
+        related_queryset = field.related_model._default_manager.all()
+        is_unique = field.one_to_one or field.unique
+
+        # Skip related rows that are already linked through a unique column
+        if is_unique:
+            taken = model._default_manager.filter(**{f'{field.attname}__isnull': False}).values(field.attname)
+            related_queryset = related_queryset.exclude(**{f'{field.target_field.attname}__in': taken})
+
+        pools[field.name] = RelatedKeyPool(related_queryset, field.target_field.attname, unique=is_unique)
+
+    for field in model._meta.local_many_to_many:
+        pools[field.name] = RelatedKeyPool(field.related_model._default_manager.all())
+
+    return pools
+
+
+def draw_related_key(field, pool):
+    key = pool.draw()
+
+    if key is None and not field.null:
+        raise ValueError(
+            f"Cannot populate {field.model.__name__}.{field.name}: "
+            f"no {'unused ' if pool.unique else ''}{field.related_model.__name__} rows left."
+        )
+
+    return key
+
+
+def choice_strategy(field, model):
+    values = [choice[0] for choice in field.flatchoices]
+    return lambda index, pools: random.choice(values)
+
+
+def positive_integer_strategy(field, model):
+    return lambda index, pools: random.randint(1, 100)
+
+
+def integer_strategy(field, model):
+    return lambda index, pools: random.randint(-100, 100)
+
+
+def get_validator_bounds(field, low, high):
+    for validator in field.validators:
+        if isinstance(validator, MinValueValidator):
+            low = max(low, float(validator.limit_value))
+        elif isinstance(validator, MaxValueValidator):
+            high = min(high, float(validator.limit_value))
+
+    return low, high
+
+
+def float_strategy(field, model):
+    low, high = get_validator_bounds(field, 0.0, 100.0)
+    return lambda index, pools: round(random.uniform(low, high), 2)
+
+
+def boolean_strategy(field, model):
+    return lambda index, pools: random.choice([True, False])
+
+
+def text_strategy(field, model):
+    prefix = model.__name__
+    return lambda index, pools: f"{prefix} {index + 1}"
+
+
+def email_strategy(field, model):
+    return lambda index, pools: f"{random.choice(['user', 'admin', 'customer'])}@example.com"
+
+
+def decimal_strategy(field, model):
+    decimal_places = field.decimal_places
+    upper_bound = 10 ** (field.max_digits - decimal_places) - 10 ** -decimal_places
+    return lambda index, pools: Decimal(f"{random.uniform(1, upper_bound):.{decimal_places}f}")
+
+
+def date_strategy(field, model):
+    start_date = EPOCH_START.date()
+    days_range = (EPOCH_END - EPOCH_START).days
+    return lambda index, pools: start_date + timedelta(days=random.randint(0, days_range))
+
+
+def datetime_strategy(field, model):
+    start_date = EPOCH_START
+    seconds_range = int((EPOCH_END - EPOCH_START).total_seconds())
+
+    if isinstance(field, DateTimeField) and settings.USE_TZ:
+        start_date = start_date.replace(tzinfo=dt_timezone.utc)
+
+    return lambda index, pools: start_date + timedelta(seconds=random.randint(0, seconds_range))
+
+
+def related_key_strategy(field, model):
+    return lambda index, pools: draw_related_key(field, pools[field.name])
+
+
+def student_id_strategy(field, model):
+    return lambda index, pools: index + 1
+
+
+def credit_card_strategy(field, model):
+    return lambda index, pools: ''.join(random.choices('0123456789', k=16))
+
+
+def skip_strategy(field, model):
+    return None
+
+
+# Looked up along the field class MRO, so the most specific registration wins.
+# Keys are field classes or, for fields that live in a single project, class names.
+FIELD_STRATEGIES = {
+    AutoFieldMixin: skip_strategy,
+    PositiveIntegerField: positive_integer_strategy,
+    PositiveSmallIntegerField: positive_integer_strategy,
+    PositiveBigIntegerField: positive_integer_strategy,
+    IntegerField: integer_strategy,
+    FloatField: float_strategy,
+    BooleanField: boolean_strategy,
+    CharField: text_strategy,
+    TextField: text_strategy,
+    EmailField: email_strategy,
+    DecimalField: decimal_strategy,
+    DateField: date_strategy,
+    DateTimeField: datetime_strategy,
+    ForeignKey: related_key_strategy,
+    OneToOneField: related_key_strategy,
+    'StudentIDField': student_id_strategy,
+    'MaskedCreditCardField': credit_card_strategy,
+    'UnixTimeStampField': datetime_strategy,
+    'SearchVectorField': skip_strategy,
+    'CounterCacheField': skip_strategy,
+}
+
+_strategy_plans = {}
+
+
+def register_field_strategy(field_class, strategy):
+    """
+    Register a strategy for a field class (or class name). A strategy receives the field and the model
+    and returns a callable(index, pools) producing one value, or None to leave the field to its default.
+    """
+    FIELD_STRATEGIES[field_class] = strategy
+    _strategy_plans.clear()
+
+
+def lookup_by_field_class(field, registry):
+    for field_class in type(field).__mro__:
+        entry = registry.get(field_class) or registry.get(field_class.__name__)
+        if entry:
+            return entry
+
+    return None
+
+
+def find_field_strategy(field):
+    if field.choices and not isinstance(field, AutoField):
+        return choice_strategy
+
+    return lookup_by_field_class(field, FIELD_STRATEGIES)
+
+
+def get_strategy_plan(model):
+    plan = _strategy_plans.get(model)
+
+    if plan is None:
+        plan = []
+        for field in model._meta.fields:
+            # auto_now / auto_now_add values are filled in on save anyway
+            if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False):
+                continue
+
+            strategy = find_field_strategy(field)
+            generator = strategy(field, model) if strategy else None
+
+            if generator is not None:
+                plan.append((field.attname, generator))
+
+        _strategy_plans[model] = plan
+
+    return plan
+
+
+def generate_field_values(model, index, pools):
+    return {attname: generator(index, pools) for attname, generator in get_strategy_plan(model)}
+
+
+def populate_model_with_data(model, num_records=10, batch_size=None):
+    if batch_size:
+        return populate_model_in_batches(model, num_records, batch_size)
+
+    many_to_many_fields = model._meta.local_many_to_many
+    pools = build_related_key_pools(model)
+
+    for _ in range(num_records):
+        field_values = generate_field_values(model, _, pools)
+
+        # Create the model instance
+        instance = model.objects.create(**field_values)
+
+        # Handle ManyToManyFields after instance creation
+        for field in many_to_many_fields:
+            related_keys = pools[field.name].sample(random.randint(1, 5))
+            getattr(instance, field.name).set(related_keys)
+
+
+def estimate_row_size(field_values):
+    # Rough footprint of one row: the dict, its values and the model instance built from it
+    values_size = sum(sys.getsizeof(value) for value in field_values.values())
+    return 3 * (sys.getsizeof(field_values) + values_size)
+
+
+class SeedingPipeline:
+    """
+    Lazy generate -> chunk -> write pipeline. Rows are produced in a background thread and handed
+    to the writer (which runs in the calling thread, on its database connection) through a bounded
+    queue. A full queue blocks the producer, so at most max_pending_chunks chunks are waiting at any
+    time, and chunks are sized so that all of them together stay under max_memory_mb.
+    """
+
+    def __init__(self, model, num_records, chunk_size=1000, max_memory_mb=256, max_pending_chunks=2,
+                 first_index=0, writer=None):
+        self.model = model
+        self.num_records = num_records
+        self.chunk_size = chunk_size
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        self.max_pending_chunks = max_pending_chunks
+        self.first_index = first_index
+        self.pools = build_related_key_pools(model)
+        self.writer = writer or bulk_create_writer
+
+    def rows(self):
+        for index in range(self.first_index, self.first_index + self.num_records):
+            yield generate_field_values(self.model, index, self.pools)
+
+    def chunks(self):
+        chunk = []
+        chunk_size = None
+
+        for field_values in self.rows():
+            if chunk_size is None:
+                # Pending chunks, the one being built and the one being written share the budget
+                chunk_budget = self.max_memory_bytes // (self.max_pending_chunks + 2)
+                chunk_size = max(1, min(self.chunk_size, chunk_budget // estimate_row_size(field_values)))
+
+            chunk.append(field_values)
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def put(pending, item, stop):
+        # Blocks while the writer is behind (backpressure), gives up once the writer has stopped
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def produce(self, pending, stop):
+        try:
+            for chunk in self.chunks():
+                if not self.put(pending, chunk, stop):
+                    return
+
+            self.put(pending, None, stop)
+        except BaseException as error:
+            self.put(pending, error, stop)
+
+    def run(self):
+        pending = queue.Queue(maxsize=self.max_pending_chunks)
+        stop = threading.Event()
+        producer = threading.Thread(target=self.produce, args=(pending, stop), daemon=True)
+        producer.start()
+
+        written = 0
+        try:
+            while (chunk := pending.get()) is not None:
+                if isinstance(chunk, BaseException):
+                    raise chunk
+
+                self.writer(self.model, chunk, self.pools)
+                written += len(chunk)
+        finally:
+            stop.set()
+            producer.join()
+
+        return written
+
+
+def bulk_create_writer(model, chunk, pools):
+    # One transaction per chunk: the rows and their M2M links are flushed together
+    with transaction.atomic():
+        created = model.objects.bulk_create([model(**field_values) for field_values in chunk])
+        link_many_to_many_in_bulk(model, created, pools, len(created))
+
+
+def get_loaded_models(model):
+    """The model and its M2M through models, the tables a seeding helper writes to."""
+    return [model, *[field.remote_field.through for field in model._meta.local_many_to_many]]
+
+
+def populate_model_in_batches(model, num_records=10, batch_size=1000, first_index=0, max_memory_mb=256,
+                              reconcile=True):
+    written = SeedingPipeline(
+        model,
+        num_records,
+        chunk_size=batch_size,
+        max_memory_mb=max_memory_mb,
+        first_index=first_index
+    ).run()
+
+    # bulk_create() sends no signals, so the counter caches are recounted once at the end
+    if written and reconcile:
+        reconcile_loaded_models(get_loaded_models(model))
+
+    return written
+
+
+def link_many_to_many_in_bulk(model, instances, pools, batch_size=1000):
+    for field in model._meta.local_many_to_many:
+        # Custom "through" models may carry extra required columns, so they are not filled here
+        through = field.remote_field.through
+        if not through._meta.auto_created:
+            continue
+
+        source_column = field.m2m_field_name()
+        target_column = field.m2m_reverse_field_name()
+        pool = pools[field.name]
+
+        if not pool:
+            continue
+
+        links = []
+        for instance in instances:
+            for related_pk in pool.sample(random.randint(1, 5)):
+                links.append(through(**{
+                    f'{source_column}_id': instance.pk,
+                    f'{target_column}_id': related_pk,
+                }))
+
+        through.objects.bulk_create(links, batch_size=batch_size, ignore_conflicts=True)
+
+
+def populate_model_with_copy(model, num_records=10, chunk_size=10_000):
+    """
+    Generate rows with the model's strategy plan and stream them through load_rows (COPY on PostgreSQL).
+    Primary keys are assigned up front so the M2M links can be streamed right after the rows.
+    """
+    pools = build_related_key_pools(model)
+    first_pk = (model._default_manager.aggregate(max_pk=Max('pk'))['max_pk'] or 0) + 1
+    pk_name = model._meta.pk.attname
+
+    def generate_rows():
+        for index in range(num_records):
+            field_values = generate_field_values(model, index, pools)
+            field_values[pk_name] = first_pk + index
+            yield field_values
+
+    # Fields without a strategy are loaded with their defaults
+    field_names = [field.attname for field in model._meta.concrete_fields]
+    load_rows(model, generate_rows(), field_names, chunk_size, reconcile=False)
+
+    for field in model._meta.local_many_to_many:
+        through = field.remote_field.through
+        pool = pools[field.name]
+
+        if not through._meta.auto_created or not pool:
+            continue
+
+        source_column = f'{field.m2m_field_name()}_id'
+        target_column = f'{field.m2m_reverse_field_name()}_id'
+        links = (
+            (pk, related_pk)
+            for pk in range(first_pk, first_pk + num_records)
+            for related_pk in pool.sample(random.randint(1, 5))
+        )
+        load_rows(through, links, [source_column, target_column], chunk_size, reconcile=False)
+
+    if num_records:
+        reconcile_loaded_models(get_loaded_models(model))
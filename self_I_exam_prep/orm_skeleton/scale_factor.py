@@ -0,0 +1,130 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from importlib import import_module
+
+from django.conf import settings
+from django.db.models import DateTimeField
+
+from orm_skeleton.counter_cache import reconcile_counter_caches
+from orm_skeleton.vectorized import np, populate_model_vectorized
+
+# SF1 = 10k rows, SF100 = 1M rows, shared between the models of a spec
+SCALE_FACTOR_ROWS = 10_000
+
+
+class Uniform:
+    """Every related row is equally likely."""
+
+    def weights(self, n, rng):
+        return np.full(n, 1 / n)
+
+
+class Zipf:
+    """
+    The k-th most popular related row is drawn with probability ~ 1 / k ** exponent,
+    e.g. a few authors write most of the books. Which rows are popular is decided by the seed.
+    """
+
+    def __init__(self, exponent=1.2):
+        self.exponent = exponent
+
+    def weights(self, n, rng):
+        weights = np.arange(1, n + 1, dtype=float) ** -self.exponent
+        return rng.permutation(weights / weights.sum())
+
+
+class LongTail:
+    """Log-normally distributed popularity: most rows get a few references, some get very many."""
+
+    def __init__(self, sigma=1.5):
+        self.sigma = sigma
+
+    def weights(self, n, rng):
+        weights = rng.lognormal(0.0, self.sigma, n)
+        return weights / weights.sum()
+
+
+class Bursty:
+    """
+    Timestamps clustered around a number of bursts (e.g. chat activity) on top of a uniform background.
+    Works for DateField and DateTimeField columns.
+    """
+
+    def __init__(self, bursts=24, burst_share=0.8, spread=timedelta(hours=2),
+                 start=datetime(2020, 1, 1), end=datetime(2025, 1, 1)):
+        self.bursts = bursts
+        self.burst_share = burst_share
+        self.spread = spread
+        self.start = start
+        self.end = end
+
+    def column(self, field, rng, size):
+        total_seconds = int((self.end - self.start).total_seconds())
+        centers = rng.integers(0, total_seconds, self.bursts)
+
+        in_burst = rng.random(size) < self.burst_share
+        offsets = rng.integers(0, total_seconds, size)
+        jitter = np.abs(rng.normal(0, self.spread.total_seconds(), size)).astype(np.int64)
+        offsets = np.where(in_burst, centers[rng.integers(0, self.bursts, size)] + jitter, offsets)
+        offsets = np.clip(offsets, 0, total_seconds - 1)
+
+        values = [self.start + timedelta(seconds=offset) for offset in offsets.tolist()]
+
+        if not isinstance(field, DateTimeField):
+            return [value.date() for value in values]
+
+        if settings.USE_TZ:
+            return [value.replace(tzinfo=timezone.utc) for value in values]
+
+        return values
+
+
+def get_rows_per_model(spec, scale_factor):
+    total_rows = scale_factor * SCALE_FACTOR_ROWS
+    return [(model, max(1, round(options['share'] * total_rows))) for model, options in spec['models']]
+
+
+def generate_dataset(spec, scale_factor=1, batch_size=10_000):
+    """
+    Seed every model of a declarative spec at the given scale factor.
+
+    spec = {
+        'seed': 2025,
+        'models': [
+            (Author, {'share': 0.2}),
+            (Book, {'share': 0.8, 'profiles': {'main_author': Zipf(1.2)}}),
+        ],
+    }
+
+    Models are seeded in the listed order, so parents come first. Each model gets its own
+    sub-seed, which keeps a model's rows stable when another model's share changes.
+    """
+    if np is None:
+        raise ImportError("generate_dataset requires numpy (pip install numpy).")
+
+    options_by_model = dict(spec['models'])
+
+    for index, (model, num_records) in enumerate(get_rows_per_model(spec, scale_factor)):
+        populate_model_vectorized(
+            model,
+            num_records,
+            batch_size=batch_size,
+            seed=[spec['seed'], index],
+            profiles=options_by_model[model].get('profiles'),
+            reconcile=False,
+        )
+
+    # Rows are bulk loaded without signals, so counter caches are recounted once at the end
+    reconcile_counter_caches()
+
+
+if __name__ == '__main__':
+    # python -m orm_skeleton.scale_factor <scale factor>
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "orm_skeleton.settings")
+    django.setup()
+
+    dataset_spec = import_module('main_app.dataset_spec')
+    generate_dataset(dataset_spec.DATASET_SPEC, scale_factor=float(sys.argv[1]) if len(sys.argv) > 1 else 1)